@@ -13,6 +13,7 @@ Returns [] if stable-ts is not installed or WHISPER_ALIGNMENT_MODEL is empty.
 import asyncio
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -22,6 +23,7 @@ logger = logging.getLogger(__name__)
 
 _model = None
 _model_lock: Optional[asyncio.Lock] = None
+_executor: Optional[ThreadPoolExecutor] = None
 
 
 def _get_lock() -> asyncio.Lock:
@@ -31,6 +33,15 @@ def _get_lock() -> asyncio.Lock:
     return _model_lock
 
 
+def _get_executor() -> ThreadPoolExecutor:
+    """Dedicated single worker for Whisper — model load and alignment run for
+    seconds at a time and must not tie up the loop's default executor."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+    return _executor
+
+
 async def _load_model():
     """Lazy-load and cache the stable_whisper model."""
     global _model
@@ -47,9 +58,9 @@ async def _load_model():
             return _model
         try:
             import stable_whisper
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             loaded = await loop.run_in_executor(
-                None, lambda: stable_whisper.load_model(model_name)
+                _get_executor(), lambda: stable_whisper.load_model(model_name)
             )
             _model = loaded
             logger.info("stable_whisper model '%s' loaded", model_name)
@@ -110,7 +121,7 @@ async def align_lyrics(
     lang = _LANG_MAP.get(vocal_language or "", vocal_language)
 
     try:
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         clean_lyrics = _strip_section_markers(lyrics)
 
         def _run():
@@ -126,7 +137,7 @@ async def align_lyrics(
                     )
             return model.transcribe(str(audio_path), language=lang)
 
-        result = await loop.run_in_executor(None, _run)
+        result = await loop.run_in_executor(_get_executor(), _run)
 
         timestamps = []
         for seg in result.segments:
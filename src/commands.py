@@ -3,6 +3,7 @@ import json
 import logging
 from pathlib import Path
 
+from . import fastjson
 from .config import RADIOS_DIR
 from .manager import Radio
 from .errors import format_error
@@ -37,8 +38,8 @@ def check_disk(radio: Radio) -> bool:
 def update_recipe(json_path: Path, updates: dict):
     """Merge updates into an existing recipe JSON file."""
     try:
-        recipe = json.loads(json_path.read_text())
+        recipe = fastjson.loads(json_path.read_bytes())
         recipe.update(updates)
-        json_path.write_text(json.dumps(recipe, indent=2))
+        json_path.write_bytes(fastjson.dumps(recipe, indent=True))
     except Exception:
         pass
@@ -1,6 +1,5 @@
 """Module 1 — Config & Constants"""
 import os
-import sys
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -19,10 +18,18 @@ ERRORS_LOG = OUTPUT_DIR / "errors.log"
 ACESTEP_HOST = os.getenv("ACESTEP_HOST", "http://localhost:8001").rstrip("/")
 ACESTEP_TIMEOUT = int(os.getenv("ACESTEP_TIMEOUT", "600"))
 ACESTEP_MODEL = os.getenv("ACESTEP_MODEL", "acestep/acestep-v15-turbo-shift3")
+ACESTEP_BOOT_TIMEOUT = float(os.getenv("ACESTEP_BOOT_TIMEOUT", "180"))  # auto-start wait, seconds
+ACESTEP_POLL_MIN = float(os.getenv("ACESTEP_POLL_MIN", "0.1"))          # first /health poll delay
+ACESTEP_POLL_MAX = float(os.getenv("ACESTEP_POLL_MAX", "2.0"))          # backoff cap
 
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434").rstrip("/")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2:3b")
 OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "90"))
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")       # keep model + KV cache resident
+OLLAMA_NUM_CTX = int(os.getenv("OLLAMA_NUM_CTX", "4096"))
+OLLAMA_NUM_PREDICT = int(os.getenv("OLLAMA_NUM_PREDICT", "512"))  # caps response length
+
+PREFLIGHT_HTTP_TIMEOUT = float(os.getenv("PREFLIGHT_HTTP_TIMEOUT", "5"))  # health probes
 
 # ─── Generation defaults ──────────────────────────────────────────────────────
 DEFAULT_DURATION = int(os.getenv("DEFAULT_DURATION", "180"))
@@ -77,3 +84,10 @@ DEV_MODE = os.getenv("DEV_MODE", "1").strip() in ("1", "true", "yes")
 # Whisper model for lyrics forced alignment. "tiny" is fast (~10s/track on CPU).
 # Set to "" or "none" in .env to disable alignment (falls back to estimation).
 WHISPER_ALIGNMENT_MODEL = os.getenv("WHISPER_ALIGNMENT_MODEL", "tiny")
+
+# ─── Semantic tag matching ────────────────────────────────────────────────────
+# Load the sentence-transformers tag index on a background thread at startup,
+# so the first semantic tag match does not block on the model load.
+WARM_SEMANTIC_INDEX = os.getenv("WARM_SEMANTIC_INDEX", "0").strip() in ("1", "true", "yes")
+# Whitelist embeddings are saved here so later starts skip re-encoding them
+SEMANTIC_CACHE_DIR = OUTPUT_DIR / ".cache"
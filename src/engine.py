@@ -3,19 +3,18 @@
 Receives commands via methods, broadcasts state via RadioState.
 """
 import asyncio
-import json
 import logging
 import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from .config import DEFAULT_DURATION, RADIOS_DIR
+from . import fastjson
 from .manager import Radio, RadioManager, _slugify
 from .reactions import parse_reaction
 from .llm import generate_params, params_are_too_similar
 from .acestep import generate_track
-from .player import Player, get_audio_duration
+from .player import Player, get_audio_duration_async
 from .errors import format_error
 from .utils import friendly_redirect
 from .commands import check_disk, update_recipe, append_metric
@@ -54,6 +53,8 @@ class RadioEngine:
 
         # Track tick task
         self._tick_task: Optional[asyncio.Task] = None
+        self._volume_broadcast: Optional[asyncio.TimerHandle] = None
+        self._volume_task: Optional[asyncio.Task] = None
         self._model_ensured = False
 
     # ── Public API (called from WebSocket handlers) ──────────────────────────
@@ -164,7 +165,18 @@ class RadioEngine:
 
     async def set_volume(self, level: int):
         self.player.set_volume(level)
-        await self._broadcast_playback_state()
+        # A slider drag sends a burst of volume messages — broadcast only the
+        # settled value instead of one playback_state per step.
+        if self._volume_broadcast is not None:
+            self._volume_broadcast.cancel()
+        self._volume_broadcast = asyncio.get_running_loop().call_later(
+            0.08, self._start_volume_broadcast
+        )
+
+    def _start_volume_broadcast(self):
+        """Timer callback for set_volume — the task is kept so it can't be collected mid-run."""
+        self._volume_broadcast = None
+        self._volume_task = asyncio.create_task(self._broadcast_playback_state())
 
     async def seek(self, delta: float):
         self.player.seek(delta)
@@ -212,8 +224,9 @@ class RadioEngine:
         """Create a new radio and switch to it."""
         await self.switch_radio(name)
         if vibe:
-            self.radio.add_note(vibe)
-            self.radio.set_direction(vibe)
+            with self.radio.edit_taste():
+                self.radio.add_note(vibe)
+                self.radio.set_direction(vibe)
             self._last_reaction = vibe
         return True
 
@@ -246,8 +259,9 @@ class RadioEngine:
     async def set_first_vibe(self, text: str):
         """Set initial direction for a new radio (first-run flow)."""
         if text:
-            self.radio.add_note(text)
-            self.radio.set_direction(text)
+            with self.radio.edit_taste():
+                self.radio.add_note(text)
+                self.radio.set_direction(text)
             self._last_reaction = text
             self._reaction_event.set()
 
@@ -269,6 +283,15 @@ class RadioEngine:
                 await self._tick_task
             except (asyncio.CancelledError, Exception):
                 pass
+        if self._volume_broadcast is not None:
+            self._volume_broadcast.cancel()
+            self._volume_broadcast = None
+        if self._volume_task and not self._volume_task.done():
+            self._volume_task.cancel()
+            try:
+                await self._volume_task
+            except (asyncio.CancelledError, Exception):
+                pass
 
     # ── Main loop ────────────────────────────────────────────────────────────
 
@@ -346,7 +369,7 @@ class RadioEngine:
         # ── Play queued track now if it's not already playing (avoids silence gap) ──
         if self._queued_track and self._queued_track.exists():
             if not (self.player.is_playing() and self.player.current_track == self._queued_track):
-                dur = get_audio_duration(self._queued_track)
+                dur = await get_audio_duration_async(self._queued_track)
                 self.player.play(self._queued_track, duration=dur)
                 await self.state.broadcast("now_playing", self._build_now_playing(self._queued_params, self._queued_track))
                 await self._broadcast_playback_state()
@@ -444,11 +467,7 @@ class RadioEngine:
 
         try:
             # Phase 1: ACE-Step
-            while not self._gen_task.done():
-                await asyncio.sleep(0.5)
-                await self.state.broadcast("generation_progress", {
-                    "elapsed": round(time.monotonic() - gen_start, 1),
-                })
+            await self._poll_with_progress(self._gen_task, gen_start)
         finally:
             if looper and not looper.done():
                 looper.cancel()
@@ -462,17 +481,13 @@ class RadioEngine:
 
         # Phase 2: Whisper alignment (vocal tracks only — keep progress ticking)
         align_task = asyncio.create_task(self._run_alignment(params, next_path))
-        while not align_task.done():
-            await asyncio.sleep(0.5)
-            await self.state.broadcast("generation_progress", {
-                "elapsed": round(time.monotonic() - gen_start, 1),
-            })
+        await self._poll_with_progress(align_task, gen_start)
         await align_task
 
         # Phase 3: Play — track is fully ready (audio + lyrics)
-        dur = get_audio_duration(next_path)
+        dur = await get_audio_duration_async(next_path)
         self.player.play(next_path, duration=dur)
-        self._commit_track(params, next_path, gen_start)
+        await self._commit_track(params, next_path, gen_start)
         self._queued_track = next_path
         self._queued_params = params
         self._last_params = params
@@ -513,7 +528,7 @@ class RadioEngine:
                     success, _ = await self._get_gen_result()
                     if success and next_path.exists():
                         await self._run_alignment(params, next_path)
-                        dur = get_audio_duration(next_path)
+                        dur = await get_audio_duration_async(next_path)
                         self.player.play(next_path, duration=dur)
                         self._queued_track = next_path
                         self._queued_params = params
@@ -532,7 +547,7 @@ class RadioEngine:
                     success, _ = await self._get_gen_result()
                     if success and next_path.exists():
                         await self._run_alignment(params, next_path)
-                        dur = get_audio_duration(next_path)
+                        dur = await get_audio_duration_async(next_path)
                         self.player.play(next_path, duration=dur)
                         self._queued_track = next_path
                         self._queued_params = params
@@ -587,7 +602,7 @@ class RadioEngine:
             await self._handle_gen_failure(params, next_path, err, gen_start)
             return
 
-        self._commit_track(params, next_path, gen_start)
+        await self._commit_track(params, next_path, gen_start)
 
         if not auto_advanced:
             # Track not yet played — run alignment now so it's ready when played
@@ -611,21 +626,22 @@ class RadioEngine:
 
     async def _discard_and_regenerate(self, reaction: dict, user_input: str):
         """Cancel in-flight generation, record taste, and signal main loop."""
-        # Record taste on the track user was hearing
-        if reaction.get("signal") and self._queued_params:
-            self.radio.add_reaction(self._queued_params, reaction["signal"])
-            if self._queued_track:
-                jpath = self._queued_track.with_suffix(".json")
-                if jpath.exists():
-                    update_recipe(jpath, {"reaction": reaction["signal"]})
-
-        if reaction.get("modifiers"):
-            for mod in reaction["modifiers"]:
-                self.radio.add_note(mod)
-        if reaction.get("mood"):
-            self.radio.set_direction(f"mood: {reaction['mood']}")
-        if reaction.get("direction") == "reset":
-            self.radio.set_direction("reset — bold departure from recent tracks")
+        # Record taste on the track user was hearing (one taste.json write for all updates)
+        with self.radio.edit_taste():
+            if reaction.get("signal") and self._queued_params:
+                self.radio.add_reaction(self._queued_params, reaction["signal"])
+            if reaction.get("modifiers"):
+                for mod in reaction["modifiers"]:
+                    self.radio.add_note(mod)
+            if reaction.get("mood"):
+                self.radio.set_direction(f"mood: {reaction['mood']}")
+            if reaction.get("direction") == "reset":
+                self.radio.set_direction("reset — bold departure from recent tracks")
+
+        if reaction.get("signal") and self._queued_params and self._queued_track:
+            jpath = self._queued_track.with_suffix(".json")
+            if jpath.exists():
+                update_recipe(jpath, {"reaction": reaction["signal"]})
 
         # Cancel in-flight generation
         if self._gen_task and not self._gen_task.done():
@@ -701,9 +717,9 @@ class RadioEngine:
 
         # Retry succeeded — run alignment before playing
         await self._run_alignment(params, next_path)
-        dur = get_audio_duration(next_path)
+        dur = await get_audio_duration_async(next_path)
         self.player.play(next_path, duration=dur)
-        self._commit_track(params, next_path, gen_start)
+        await self._commit_track(params, next_path, gen_start)
         self._queued_track = next_path
         self._queued_params = params
         self._last_params = params
@@ -711,10 +727,13 @@ class RadioEngine:
         await self.state.broadcast("now_playing", self._build_now_playing(params, next_path))
         await self._broadcast_playback_state()
 
-    def _commit_track(self, params, next_path, gen_start):
+    async def _commit_track(self, params, next_path, gen_start):
         """Write recipe, increment count, log metrics."""
         gen_elapsed = time.monotonic() - gen_start
-        audio_dur = get_audio_duration(next_path) if next_path.exists() else None
+        # The caller usually just started playing this track with its duration
+        audio_dur = self.player.duration if self.player.current_track == next_path else None
+        if audio_dur is None and next_path.exists():
+            audio_dur = await get_audio_duration_async(next_path)
         try:
             file_size = next_path.stat().st_size if next_path.exists() else None
         except OSError:
@@ -730,7 +749,7 @@ class RadioEngine:
         }
 
         try:
-            next_path.with_suffix(".json").write_text(json.dumps(recipe, indent=2))
+            next_path.with_suffix(".json").write_bytes(fastjson.dumps(recipe, indent=True))
         except OSError:
             pass
 
@@ -800,6 +819,23 @@ class RadioEngine:
             "has_track": self.player.current_track is not None,
         })
 
+    async def _poll_with_progress(self, task, gen_start):
+        """Poll until task is done, broadcasting progress as the shown second changes.
+
+        Polling stays at 0.5s so completion is picked up promptly, but the
+        client only renders whole seconds — unchanged ticks aren't sent.
+        """
+        last_shown = None
+        while not task.done():
+            await asyncio.sleep(0.5)
+            elapsed = time.monotonic() - gen_start
+            shown = round(elapsed)
+            if shown != last_shown:
+                last_shown = shown
+                await self.state.broadcast("generation_progress", {
+                    "elapsed": round(elapsed, 1),
+                })
+
     async def _broadcast_gen_progress(self, gen_start):
         """Periodically broadcast generation progress."""
         while not self._gen_task.done():
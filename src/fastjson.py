@@ -0,0 +1,28 @@
+"""JSON encode/decode — orjson when installed, stdlib json otherwise."""
+import json
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib is always available
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: str | bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent: bool = False, default=None) -> bytes:
+    """Serialize to UTF-8 bytes. indent=True pretty-prints with 2 spaces.
+
+    default converts otherwise unserializable objects, as in json.dumps.
+    """
+    if orjson is not None:
+        # NON_STR_KEYS: int keys become strings, as with json.dumps
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False, default=default).encode()
@@ -0,0 +1,54 @@
+"""Aho–Corasick keyword automaton — find many fixed keywords in one linear pass."""
+from collections import deque
+from typing import Any, Iterator
+
+
+class KeywordAutomaton:
+    """Multi-keyword matcher built once at import time, scanned many times.
+
+    Usage mirrors pyahocorasick: add_word() for every keyword, make_automaton()
+    once, then iter(text) yields (start, end, value) for every occurrence —
+    overlapping matches included — in a single left-to-right scan.
+    """
+
+    def __init__(self):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[int, Any]]] = [[]]
+
+    def add_word(self, word: str, value: Any):
+        node = 0
+        for ch in word:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][ch] = nxt
+            node = nxt
+        self._out[node].append((len(word), value))
+
+    def make_automaton(self):
+        """Compute failure links (BFS) and merge suffix outputs into each state."""
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+    def iter(self, text: str) -> Iterator[tuple[int, int, Any]]:
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, value in out[node]:
+                yield i + 1 - length, i + 1, value
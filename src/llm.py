@@ -5,7 +5,7 @@ System prompt sourced from:
 - Ace-Step_Data-Tool config/prompts.json (category limits, tag ordering)
 - ace-step-ui (generation parameter defaults, style presets)
 """
-import json
+import functools
 import re
 import random
 from typing import Optional
@@ -16,20 +16,24 @@ from .config import (
     OLLAMA_HOST,
     OLLAMA_MODEL,
     OLLAMA_TIMEOUT,
+    OLLAMA_KEEP_ALIVE,
+    OLLAMA_NUM_CTX,
+    OLLAMA_NUM_PREDICT,
     BPM_MIN,
     BPM_MAX,
-    BPM_RELIABLE_MIN,
-    BPM_RELIABLE_MAX,
     VALID_TIME_SIGS,
-    VALID_KEYS,
 )
+from . import fastjson
+from .keywords import KeywordAutomaton
 from .tags import (
-    validate_and_order_tags,
     validate_and_order_tags_detailed,
-    GENRES, MOODS, INSTRUMENTS, VOCALS, VOCAL_FX, RAP_STYLES, TEXTURES,
+    validate_and_order_tags_from_list,
+    GENRES, MOODS, INSTRUMENTS, VOCALS, RAP_STYLES, TEXTURES,
     _GENRE_SET, _INSTRUMENT_SET,
 )
 
+# Sent verbatim as the first message of every request so Ollama's prompt/KV cache
+# can reuse the prefix across calls — keep it constant at runtime.
 _SYSTEM_PROMPT = """\
 You are a personal music director for an AI radio station.
 
@@ -116,6 +120,19 @@ Hip hop track:
 {"tags": "hip hop, hard-hitting, confident, 808, drums, synth bass, male rap, gangsta rap, gritty", "lyrics": "[Verse 1 - aggressive]\\nRolling through the city streets at night\\nEvery corner got a story right\\nStack it up and never look behind\\nGrinding daily on the frontline\\n\\n[Chorus - anthemic]\\nWe don't stop we keep it moving\\nEvery day we stay improving\\n\\n[Verse 2]\\nFrom the bottom to the top we climb\\nEvery setback is a paradigm", "bpm": 142, "key_scale": "F Minor", "time_signature": 4, "vocal_language": "en", "instrumental": false, "rationale": "Hard-hitting hip hop with confident delivery and gritty 808s"}
 """
 
+_VALID_TIME_SIG_SET = frozenset(VALID_TIME_SIGS)
+# "<note> <Major|Minor>" — note is A-G with optional b/#
+_VALID_KEY_NOTES = frozenset(n + acc for n in "ABCDEFG" for acc in ("", "b", "#"))
+_VALID_KEY_MODES = frozenset(("Major", "Minor"))
+
+_RNG = random.Random()
+
+
+def _new_seed() -> int:
+    """ACE-Step seed in [0, 99999]."""
+    return _RNG.randrange(100000)
+
+
 _STRICT_SUFFIX = "\n\nCRITICAL: Output ONLY the JSON object. No words before or after. Start with { and end with }."
 
 
@@ -155,6 +172,17 @@ def _build_context(
     last_params: Optional[dict],
     recent_params: Optional[list[dict]],
 ) -> str:
+    message = user_message or "(no message — continue evolving the sound)"
+    has_recent = bool(recent_params) and len(recent_params) > 1
+
+    # Common shape (no history yet): one f-string, same output as the generic path
+    if not last_params and not has_recent:
+        return (
+            f"=== TASTE PROFILE ===\n{taste_context}\n"
+            f"\n=== USER MESSAGE ===\n{message}\n"
+            f"\n=== YOUR RESPONSE (JSON only) ==="
+        )
+
     parts = ["=== TASTE PROFILE ===", taste_context]
 
     if last_params:
@@ -169,51 +197,106 @@ def _build_context(
                 if v in last_params["tags"]:
                     last_info["vocal_type"] = v
                     break
-        parts.append(json.dumps(last_info, indent=2))
+        parts.append(fastjson.dumps(last_info, indent=True).decode())
 
-    if recent_params and len(recent_params) > 1:
+    if has_recent:
         parts.append("\n=== RECENT TRACK PATTERNS (avoid repeating) ===")
         for p in recent_params[-3:]:
             parts.append(f"  {p.get('tags', '')} | {p.get('bpm')} BPM | {p.get('key_scale', '')}")
 
-    parts.append(f"\n=== USER MESSAGE ===\n{user_message or '(no message — continue evolving the sound)'}")
+    parts.append(f"\n=== USER MESSAGE ===\n{message}")
     parts.append("\n=== YOUR RESPONSE (JSON only) ===")
 
     return "\n".join(parts)
 
 
-async def _call_ollama(user_content: str) -> str:
-    async with httpx.AsyncClient(timeout=OLLAMA_TIMEOUT) as client:
-        response = await client.post(
-            f"{OLLAMA_HOST}/api/chat",
-            json={
-                "model": OLLAMA_MODEL,
-                "messages": [
-                    {"role": "system", "content": _SYSTEM_PROMPT},
-                    {"role": "user", "content": user_content},
-                ],
-                "stream": False,
-                "options": {"temperature": 0.8},
-            },
+# Request body is fixed except for the user message: serialize it once with a
+# placeholder and splice the JSON-encoded user content in per call.
+_USER_PLACEHOLDER = "__MELTFM_USER_CONTENT__"
+_BODY_PREFIX, _BODY_SUFFIX = fastjson.dumps({
+    "model": OLLAMA_MODEL,
+    "messages": [
+        {"role": "system", "content": _SYSTEM_PROMPT},
+        {"role": "user", "content": _USER_PLACEHOLDER},
+    ],
+    "stream": False,
+    "keep_alive": OLLAMA_KEEP_ALIVE,
+    "options": {
+        "temperature": 0.8,
+        "num_ctx": OLLAMA_NUM_CTX,
+        "num_predict": OLLAMA_NUM_PREDICT,
+    },
+}).split(fastjson.dumps(_USER_PLACEHOLDER))
+
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for Ollama (created lazily inside the running loop)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=OLLAMA_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=8),
         )
-        response.raise_for_status()
-        data = response.json()
-        return data["message"]["content"].strip()
+    return _client
+
+
+async def close_client():
+    """Close the shared Ollama client (called on server shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _call_ollama(user_content: str) -> str:
+    body = _BODY_PREFIX + fastjson.dumps(user_content) + _BODY_SUFFIX
+    response = await _get_client().post(
+        f"{OLLAMA_HOST}/api/chat",
+        content=body,
+        headers={"Content-Type": "application/json"},
+    )
+    response.raise_for_status()
+    data = fastjson.loads(response.content)
+    return data["message"]["content"].strip()
 
 
 def _parse_json(raw: str) -> Optional[dict]:
     """Try to extract a JSON object from the response."""
     # Direct parse
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return fastjson.loads(raw)
+    except fastjson.JSONDecodeError:
         pass
 
-    # Extract first {...} block (handle nested braces)
+    # Fast path: outermost braces (prose or code fences around one object)
+    start, end = raw.find("{"), raw.rfind("}")
+    if start != -1 and end > start:
+        try:
+            return fastjson.loads(raw[start:end + 1])
+        except fastjson.JSONDecodeError:
+            pass
+
+    # Extract first {...} block (handle nested braces; ignore braces inside strings,
+    # e.g. lyrics containing "{" or "}")
     depth = 0
     start = None
+    in_string = False
+    escape = False
     for i, ch in enumerate(raw):
-        if ch == "{":
+        if escape:
+            escape = False
+        elif in_string:
+            if ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            if depth > 0:
+                in_string = True
+        elif ch == "{":
             if depth == 0:
                 start = i
             depth += 1
@@ -221,13 +304,31 @@ def _parse_json(raw: str) -> Optional[dict]:
             depth -= 1
             if depth == 0 and start is not None:
                 try:
-                    return json.loads(raw[start:i + 1])
-                except json.JSONDecodeError:
+                    return fastjson.loads(raw[start:i + 1])
+                except fastjson.JSONDecodeError:
                     start = None
 
     return None
 
 
+@functools.lru_cache(maxsize=256)
+def _validate_tags(raw_tags: str) -> tuple[str, tuple[str, ...]]:
+    """Whitelist pipeline for one raw tag string → (tags, warnings).
+
+    Memoized: the LLM often repeats a tag line verbatim, and normalization
+    (fuzzy + semantic matching) is the expensive part of validation.
+    """
+    tag_result = validate_and_order_tags_detailed(raw_tags)
+    warnings: list[str] = []
+    for orig, reason in tag_result.dropped:
+        warnings.append(f"Tag '{orig}' dropped ({reason})")
+    for orig, matched in tag_result.fuzzy_matched:
+        warnings.append(f"Tag '{orig}' → '{matched}' (fuzzy)")
+    for tag, reason in tag_result.truncated:
+        warnings.append(f"Tag '{tag}' truncated ({reason})")
+    return tag_result.tags, tuple(warnings)
+
+
 def _validate_and_clamp(params: dict) -> dict:
     """Ensure all fields are valid. Clamp out-of-range values. Normalize tags.
     Attaches params["_warnings"] with transparency info (stripped before recipe write).
@@ -248,7 +349,7 @@ def _validate_and_clamp(params: dict) -> dict:
     # Time signature
     try:
         ts = int(params.get("time_signature", 4))
-        if ts not in VALID_TIME_SIGS:
+        if ts not in _VALID_TIME_SIG_SET:
             warnings.append(f"Time sig {ts} → 4 (not in {VALID_TIME_SIGS})")
             ts = 4
         params["time_signature"] = ts
@@ -257,7 +358,12 @@ def _validate_and_clamp(params: dict) -> dict:
 
     # Key/scale — accept if it looks like "<note> <Major|Minor>"
     ks = params.get("key_scale", "")
-    if not isinstance(ks, str) or not re.match(r"^[A-G][b#]?\s+(Major|Minor)$", ks.strip()):
+    ks_parts = ks.split() if isinstance(ks, str) else ()
+    if not (
+        len(ks_parts) == 2
+        and ks_parts[0] in _VALID_KEY_NOTES
+        and ks_parts[1] in _VALID_KEY_MODES
+    ):
         if ks:
             warnings.append(f"Key '{ks}' → A Minor (invalid format)")
         params["key_scale"] = "A Minor"
@@ -265,14 +371,8 @@ def _validate_and_clamp(params: dict) -> dict:
     # Tags — normalize and validate through whitelist pipeline (with transparency)
     raw_tags = params.get("tags", "")
     if isinstance(raw_tags, str) and raw_tags.strip():
-        tag_result = validate_and_order_tags_detailed(raw_tags)
-        params["tags"] = tag_result.tags
-        for orig, reason in tag_result.dropped:
-            warnings.append(f"Tag '{orig}' dropped ({reason})")
-        for orig, matched in tag_result.fuzzy_matched:
-            warnings.append(f"Tag '{orig}' → '{matched}' (fuzzy)")
-        for tag, reason in tag_result.truncated:
-            warnings.append(f"Tag '{tag}' truncated ({reason})")
+        params["tags"], tag_warnings = _validate_tags(raw_tags)
+        warnings.extend(tag_warnings)
     else:
         warnings.append("No tags → defaulted to 'atmospheric, experimental'")
         params["tags"] = "atmospheric, experimental"
@@ -289,7 +389,8 @@ def _validate_and_clamp(params: dict) -> dict:
         params["rationale"] = "Evolving the sound"
 
     # Seed
-    params.setdefault("seed", random.randint(0, 99999))
+    if "seed" not in params:
+        params["seed"] = _new_seed()
 
     # Lyrics: instrumental → [inst], vocal → keep LLM lyrics (capped)
     if params.get("instrumental", True):
@@ -367,7 +468,7 @@ def _inject_vocal_preference(params: dict, user_message: str) -> dict:
     tag_list = [t.strip() for t in tags.split(",")]
     tag_list = [t for t in tag_list if t not in VOCALS]
     tag_list.append(vocal_pref)
-    params["tags"] = validate_and_order_tags(", ".join(tag_list))
+    params["tags"] = validate_and_order_tags_from_list(tag_list)
     params["instrumental"] = False
 
     return params
@@ -386,10 +487,56 @@ _MOOD_INSTRUMENT_MAP = {
 }
 
 
-def _word_boundary_match(term: str, text: str) -> bool:
-    """Check if term appears in text as a whole word/phrase (not substring)."""
-    pattern = r"(?:^|[\s,.])" + re.escape(term) + r"(?:[\s,.]|$)"
-    return bool(re.search(pattern, text))
+# Tempo hints nudge BPM relative to the last track (substring match: "slowly" counts)
+_BPM_SLOW_WORDS = ["slow", "chill", "relax", "ambient", "mellow", "sleep", "dream"]
+_BPM_FAST_WORDS = ["fast", "energy", "pump", "hype", "dance", "party", "trap"]
+
+_FALLBACK_VOCAL_ALIASES = {
+    "female singer": "female vocal", "male singer": "male vocal",
+    "female voice": "female vocal", "male voice": "male vocal",
+    "female vocals": "female vocal", "male vocals": "male vocal",
+    "with vocals": "female vocal",
+}
+
+# Every whitelist keyword tagged by (dimension, priority), scanned in one pass over
+# the message. Priority is longest-first for open-ended dimensions, list order for
+# first-match ones. Whitelist hits must sit on word boundaries (avoid "thin" in
+# "something"); vocal aliases, tempo hints and mood keys keep plain substring
+# semantics. The message is lowercased once and never rescanned.
+_FALLBACK_AC = KeywordAutomaton()
+for _dim, _words in (
+    ("genre", sorted(GENRES, key=len, reverse=True)),
+    ("mood", sorted(MOODS, key=len, reverse=True)),
+    ("instruments", sorted(INSTRUMENTS, key=len, reverse=True)),
+    ("texture", sorted(TEXTURES, key=len, reverse=True)),
+    ("vocal", VOCALS),
+    ("rap_style", RAP_STYLES),
+    ("vocal_alias", list(_FALLBACK_VOCAL_ALIASES)),
+    ("bpm_slow", _BPM_SLOW_WORDS),
+    ("bpm_fast", _BPM_FAST_WORDS),
+    ("mood_key", list(_MOOD_INSTRUMENT_MAP)),
+):
+    for _rank, _word in enumerate(_words):
+        _FALLBACK_AC.add_word(_word, (_dim, _word, _rank))
+_FALLBACK_AC.make_automaton()
+
+_SUBSTRING_DIMS = frozenset({"vocal_alias", "bpm_slow", "bpm_fast", "mood_key"})
+
+
+def _at_word_boundary(text: str, start: int, end: int) -> bool:
+    """Check if text[start:end] is a whole word/phrase (not a substring)."""
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    return (before.isspace() or before in ",.") and (after.isspace() or after in ",.")
+
+
+def _scan_keywords(msg: str) -> dict[str, list[str]]:
+    """Single Aho–Corasick pass over msg → {dimension: matched keywords by priority}."""
+    ranked: dict[str, dict[str, int]] = {}
+    for start, end, (dim, word, rank) in _FALLBACK_AC.iter(msg):
+        if dim in _SUBSTRING_DIMS or _at_word_boundary(msg, start, end):
+            ranked.setdefault(dim, {})[word] = rank
+    return {dim: sorted(words, key=words.__getitem__) for dim, words in ranked.items()}
 
 
 _FALLBACK_LYRICS = {
@@ -422,71 +569,25 @@ def _keyword_fallback(user_message: str, last_params: Optional[dict] = None) ->
     When last_params is available, uses it as a starting point instead of hardcoded defaults.
     """
     msg = user_message.lower()
-    found_genres: list[str] = []
-    found_moods: list[str] = []
-    found_instruments: list[str] = []
+    hits = _scan_keywords(msg)
+
+    found_genres: list[str] = hits.get("genre", [])[:2]
+    found_moods: list[str] = hits.get("mood", [])[:3]
+    found_instruments: list[str] = hits.get("instruments", [])[:4]
+    found_textures: list[str] = hits.get("texture", [])[:2]
+    found_rap: list[str] = hits.get("rap_style", [])[:1]
+
+    # Match vocal type (aliases first: "female singer" → "female vocal")
     found_vocal: str = "instrumental"
-    found_textures: list[str] = []
-    found_rap: list[str] = []
-
-    # Match genres from whitelist (word boundary to avoid "thin" in "something")
-    for g in sorted(GENRES, key=len, reverse=True):  # longest first
-        if _word_boundary_match(g, msg):
-            found_genres.append(g)
-            if len(found_genres) >= 2:
-                break
-
-    # Match moods from whitelist
-    for m in sorted(MOODS, key=len, reverse=True):
-        if _word_boundary_match(m, msg):
-            found_moods.append(m)
-            if len(found_moods) >= 3:
-                break
-
-    # Match instruments from whitelist
-    for i in sorted(INSTRUMENTS, key=len, reverse=True):
-        if _word_boundary_match(i, msg):
-            found_instruments.append(i)
-            if len(found_instruments) >= 4:
-                break
-
-    # Match vocal type (check aliases first: "female singer" → "female vocal")
-    vocal_aliases = {
-        "female singer": "female vocal", "male singer": "male vocal",
-        "female voice": "female vocal", "male voice": "male vocal",
-        "female vocals": "female vocal", "male vocals": "male vocal",
-        "with vocals": "female vocal",
-    }
-    for alias, target in vocal_aliases.items():
-        if alias in msg:
-            found_vocal = target
-            break
-    else:
-        for v in VOCALS:
-            if _word_boundary_match(v, msg):
-                found_vocal = v
-                break
-
-    # Match rap styles
-    for r in RAP_STYLES:
-        if _word_boundary_match(r, msg):
-            found_rap.append(r)
-            if len(found_rap) >= 1:
-                break
-
-    # Match textures
-    for t in sorted(TEXTURES, key=len, reverse=True):
-        if _word_boundary_match(t, msg):
-            found_textures.append(t)
-            if len(found_textures) >= 2:
-                break
+    if "vocal_alias" in hits:
+        found_vocal = _FALLBACK_VOCAL_ALIASES[hits["vocal_alias"][0]]
+    elif "vocal" in hits:
+        found_vocal = hits["vocal"][0]
 
     # Apply mood→instrument mapping if we have a mood but no instruments
-    if found_moods and not found_instruments:
-        for mood_key, instruments in _MOOD_INSTRUMENT_MAP.items():
-            if mood_key in msg:
-                found_instruments = instruments[:3]
-                break
+    mood_keys = hits.get("mood_key", [])
+    if found_moods and not found_instruments and mood_keys:
+        found_instruments = _MOOD_INSTRUMENT_MAP[mood_keys[0]][:3]
 
     # Use last_params as base when nothing was matched from the message
     base_bpm = last_params.get("bpm", 110) if last_params else 110
@@ -514,14 +615,13 @@ def _keyword_fallback(user_message: str, last_params: Optional[dict] = None) ->
     # Assemble and run through validation pipeline for dedup/ordering/limits
     tags_parts = (found_genres[:2] + found_moods[:3] + found_instruments[:4]
                   + [found_vocal] + found_rap[:1] + found_textures[:2])
-    raw_tags = ", ".join(tags_parts)
-    tags = validate_and_order_tags(raw_tags)
+    tags = validate_and_order_tags_from_list(tags_parts)
 
     # BPM: relative adjustments from base instead of fixed values
     bpm = base_bpm
-    if any(w in msg for w in ["slow", "chill", "relax", "ambient", "mellow", "sleep", "dream"]):
+    if "bpm_slow" in hits:
         bpm = max(BPM_MIN, base_bpm - 30)
-    elif any(w in msg for w in ["fast", "energy", "pump", "hype", "dance", "party", "trap"]):
+    elif "bpm_fast" in hits:
         bpm = min(BPM_MAX, base_bpm + 30)
 
     is_instrumental = found_vocal == "instrumental"
@@ -529,12 +629,8 @@ def _keyword_fallback(user_message: str, last_params: Optional[dict] = None) ->
     # Select mood-appropriate lyrics for vocal tracks
     lyrics = "[inst]"
     if not is_instrumental:
-        detected_mood = "default"
-        for mood_key in ("chill", "energy", "sad"):
-            if mood_key in msg:
-                detected_mood = mood_key
-                break
-        lyrics = _FALLBACK_LYRICS.get(detected_mood, _FALLBACK_LYRICS["default"])
+        detected_mood = next((k for k in mood_keys if k in _FALLBACK_LYRICS), "default")
+        lyrics = _FALLBACK_LYRICS[detected_mood]
 
     return {
         "tags": tags,
@@ -545,19 +641,19 @@ def _keyword_fallback(user_message: str, last_params: Optional[dict] = None) ->
         "vocal_language": "en",
         "instrumental": is_instrumental,
         "rationale": f"Keyword fallback from: '{user_message[:60]}'",
-        "seed": random.randint(0, 99999),
+        "seed": _new_seed(),
     }
 
 
 def params_are_too_similar(params: dict, recent: list[dict], threshold: int = 3) -> bool:
     """Detect if LLM is stuck generating near-identical params."""
-    if len(recent) < threshold:
+    n = len(recent)
+    if n < threshold:
         return False
-    last = recent[-threshold:]
-    for prev in last:
-        if (
-            abs((params.get("bpm") or 0) - (prev.get("bpm") or 0)) > 20
-            or params.get("key_scale") != prev.get("key_scale")
-        ):
+    bpm = params.get("bpm") or 0
+    key_scale = params.get("key_scale")
+    for i in range(n - threshold, n):
+        prev = recent[i]
+        if abs(bpm - (prev.get("bpm") or 0)) > 20 or key_scale != prev.get("key_scale"):
             return False
     return True
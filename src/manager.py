@@ -1,13 +1,21 @@
 """Module 2 — Radio Manager + Taste Profile"""
-import json
+import copy
+import functools
+import heapq
+import os
+import re
 import shutil
 import time
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from . import fastjson
 from .config import (
     RADIOS_DIR,
+    DEV_MODE,
     MAX_LIKED_HISTORY,
     MAX_DISLIKED_HISTORY,
     MAX_SKIPPED_HISTORY,
@@ -25,6 +33,81 @@ _EMPTY_TASTE = {
 }
 
 
+# Reaction histories are bounded deques in memory (O(1) append + eviction),
+# plain lists on disk.
+_HISTORY_LIMITS = {
+    "liked": MAX_LIKED_HISTORY,
+    "disliked": MAX_DISLIKED_HISTORY,
+    "skipped": MAX_SKIPPED_HISTORY,
+}
+
+
+def _with_history_deques(taste: dict) -> dict:
+    for key, maxlen in _HISTORY_LIMITS.items():
+        taste[key] = deque(taste.get(key) or (), maxlen=maxlen)
+    return taste
+
+
+def _empty_taste() -> dict:
+    """Fresh empty profile (deep copy — the template's lists must never be shared)."""
+    return _with_history_deques(copy.deepcopy(_EMPTY_TASTE))
+
+
+def _mp3_entries(directory: Path) -> list[os.DirEntry]:
+    """The .mp3 entries of a directory from one scandir (each entry caches its stat())."""
+    try:
+        with os.scandir(directory) as it:
+            return [e for e in it if e.name.endswith(".mp3")]
+    except FileNotFoundError:
+        return []
+
+
+def _newest_tracks(directory: Path, limit: int) -> list[tuple[str, Optional[str]]]:
+    """(mp3 name, recipe path or None) for the newest `limit` tracks, newest first.
+
+    One scandir serves both the mp3 mtimes and the recipe lookup — no per-track
+    exists() call. Selection is O(N log limit) via heapq.nlargest.
+    """
+    mp3s, recipes = [], {}
+    try:
+        with os.scandir(directory) as it:
+            for e in it:
+                if e.name.endswith(".mp3"):
+                    mp3s.append(e)
+                elif e.name.endswith(".json"):
+                    recipes[e.name[:-5]] = e.path
+    except FileNotFoundError:
+        return []
+    newest = heapq.nlargest(limit, mp3s, key=lambda e: e.stat().st_mtime)
+    return [(e.name, recipes.get(e.name[:-4])) for e in newest]
+
+
+@functools.lru_cache(maxsize=128)
+def _scan_mp3_dir(directory: str, dir_mtime: int) -> tuple[int, float]:
+    """(mp3 count, newest mp3 mtime) for a tracks or favorites dir.
+
+    Keyed by the directory's own mtime, which bumps whenever a track is added
+    or removed — so stale entries simply stop being looked up.
+    """
+    entries = _mp3_entries(Path(directory))
+    newest = max((e.stat().st_mtime for e in entries), default=0.0)
+    return len(entries), newest
+
+
+def _mp3_dir_stats(directory: Path) -> tuple[int, float]:
+    """Cached _scan_mp3_dir — one stat() of the directory on a hit."""
+    try:
+        dir_mtime = directory.stat().st_mtime_ns
+    except OSError:
+        return 0, 0.0
+    return _scan_mp3_dir(str(directory), dir_mtime)
+
+
+# tracks_dir → (monotonic timestamp, free MB); statvfs is re-run at most every _DISK_TTL_S
+_disk_cache: dict[Path, tuple[float, float]] = {}
+_DISK_TTL_S = 2.0
+
+
 class Radio:
     def __init__(self, name: str):
         self.name = name
@@ -32,6 +115,10 @@ class Radio:
         self.tracks_dir = self.path / "tracks"
         self.favorites_dir = self.path / "favorites"
         self._taste_path = self.path / "taste.json"
+        # Parsed taste.json, reused while the file's mtime is unchanged
+        self._taste_cache: Optional[dict] = None
+        self._taste_mtime: int = 0
+        self._taste_edit: Optional[dict] = None
         self._ensure_dirs()
 
     def _ensure_dirs(self):
@@ -41,28 +128,83 @@ class Radio:
     # ── Taste profile ──────────────────────────────────────────────────────────
 
     def load_taste(self) -> dict:
-        if not self._taste_path.exists():
-            return dict(_EMPTY_TASTE)
+        """Return a private copy of the taste profile — safe to mutate.
+
+        Persist changes with save_taste(), or mutate inside edit_taste() instead.
+        """
+        return copy.deepcopy(self._cached_taste())
+
+    def _cached_taste(self) -> dict:
+        """The shared taste profile, re-reading taste.json only when its mtime changed.
+
+        Read-only for callers: only edit_taste() may mutate the returned dict,
+        since it writes the result back to disk.
+        """
+        try:
+            mtime = self._taste_path.stat().st_mtime_ns
+        except OSError:
+            self.invalidate()
+            return _empty_taste()
+        if self._taste_cache is not None and mtime == self._taste_mtime:
+            return self._taste_cache
         try:
-            return json.loads(self._taste_path.read_text())
-        except (json.JSONDecodeError, OSError):
-            return dict(_EMPTY_TASTE)
+            taste = _with_history_deques(fastjson.loads(self._taste_path.read_bytes()))
+        except (fastjson.JSONDecodeError, OSError):
+            self.invalidate()
+            return _empty_taste()
+        self._taste_cache = taste
+        self._taste_mtime = mtime
+        return taste
 
     def save_taste(self, profile: dict):
-        """Atomic write — write to tmp then replace."""
+        """Atomic write — write to tmp then replace. Write-through to the cache.
+
+        Batch several mutations with edit_taste() to pay for this once.
+        Pretty-printed in DEV_MODE only; compact JSON otherwise.
+        """
         tmp = self._taste_path.with_suffix(".tmp")
-        tmp.write_text(json.dumps(profile, indent=2))
+        tmp.write_bytes(fastjson.dumps(profile, indent=DEV_MODE, default=list))  # deques → lists
         tmp.replace(self._taste_path)
+        self._taste_cache = profile
+        self._taste_mtime = self._taste_path.stat().st_mtime_ns
+
+    def invalidate(self):
+        """Drop the cached taste profile so the next load re-reads disk."""
+        self._taste_cache = None
+        self._taste_mtime = 0
+
+    @contextmanager
+    def edit_taste(self):
+        """Batch taste mutations into a single read-modify-write.
+
+        Nested edits share the outermost one, so wrapping several add_*/set_*
+        calls in `with radio.edit_taste():` writes taste.json once.
+        """
+        if self._taste_edit is not None:
+            yield self._taste_edit
+            return
+        taste = self._cached_taste()
+        self._taste_edit = taste
+        try:
+            yield taste
+        except BaseException:
+            self.invalidate()  # cached dict may hold a partial edit
+            raise
+        finally:
+            self._taste_edit = None
+        self.save_taste(taste)
 
     def is_first_run(self) -> bool:
         return not self._taste_path.exists()
 
     def reset_taste(self):
         """Wipe taste profile completely — fresh start."""
-        self.save_taste(dict(_EMPTY_TASTE))
+        self.invalidate()
+        self.save_taste(_empty_taste())
 
     def full_reset(self):
         """Wipe taste profile + all tracks + favorites. Returns radio to first-run state."""
+        self.invalidate()
         if self._taste_path.exists():
             self._taste_path.unlink()
         shutil.rmtree(self.tracks_dir, ignore_errors=True)
@@ -71,9 +213,8 @@ class Radio:
 
     def add_reaction(self, params: dict, signal: Optional[str]):
         """signal: 'liked' | 'disliked' | 'skipped' | None (neutral)"""
-        if signal is None:
+        if signal not in _HISTORY_LIMITS:
             return
-        taste = self.load_taste()
         entry = {
             "tags": params.get("tags", ""),
             "bpm": params.get("bpm"),
@@ -83,36 +224,24 @@ class Radio:
             "rationale": params.get("rationale", ""),
             "reacted_at": datetime.now().isoformat(),
         }
-        if signal == "liked":
-            taste["liked"].append(entry)
-            taste["liked"] = taste["liked"][-MAX_LIKED_HISTORY:]
-        elif signal == "disliked":
-            taste["disliked"].append(entry)
-            taste["disliked"] = taste["disliked"][-MAX_DISLIKED_HISTORY:]
-        elif signal == "skipped":
-            taste["skipped"].append(entry)
-            taste["skipped"] = taste["skipped"][-MAX_SKIPPED_HISTORY:]
-
-        self.save_taste(taste)
+        with self.edit_taste() as taste:
+            taste[signal].append(entry)  # bounded deque evicts the oldest
 
     def add_note(self, note: str):
-        taste = self.load_taste()
-        if note not in taste["explicit_notes"]:
-            taste["explicit_notes"].append(note)
-        self.save_taste(taste)
+        with self.edit_taste() as taste:
+            if note not in taste["explicit_notes"]:
+                taste["explicit_notes"].append(note)
 
     def set_direction(self, direction: str):
-        taste = self.load_taste()
-        taste["session_direction"] = direction
-        self.save_taste(taste)
+        with self.edit_taste() as taste:
+            taste["session_direction"] = direction
 
     def increment_count(self):
-        taste = self.load_taste()
-        taste["generation_count"] = taste.get("generation_count", 0) + 1
-        self.save_taste(taste)
+        with self.edit_taste() as taste:
+            taste["generation_count"] = taste.get("generation_count", 0) + 1
 
     def to_llm_context(self) -> str:
-        taste = self.load_taste()
+        taste = self._cached_taste()
         lines = [f"Radio: {self.name}"]
 
         if taste["explicit_notes"]:
@@ -122,12 +251,12 @@ class Radio:
 
         if taste["liked"]:
             lines.append(f"Liked tracks (last {len(taste['liked'])}):")
-            for t in taste["liked"][-5:]:
+            for t in list(taste["liked"])[-5:]:
                 lines.append(f"  - {t['tags']} | {t['bpm']} BPM | {t['key_scale']}")
 
         if taste["disliked"]:
             lines.append("Disliked tracks (avoid these patterns):")
-            for t in taste["disliked"][-3:]:
+            for t in list(taste["disliked"])[-3:]:
                 lines.append(f"  - {t['tags']}")
 
         if taste["session_direction"]:
@@ -141,14 +270,14 @@ class Radio:
     # ── Track management ───────────────────────────────────────────────────────
 
     def next_track_id(self) -> str:
-        taste = self.load_taste()
+        taste = self._cached_taste()
         n = taste.get("generation_count", 0) + 1
         return f"{n:03d}"
 
     def save_track(self, audio_bytes: bytes, params: dict) -> tuple[Path, Path]:
         """Save .mp3 and .json recipe. Caller is responsible for increment_count().
         Returns (mp3_path, json_path)."""
-        track_id = params.get("id", self.next_track_id())
+        track_id = params.get("id") or self.next_track_id()  # only load taste when needed
         slug = _slugify(params.get("tags", "track"))[:40]
         base = f"{track_id}-{slug}"
 
@@ -156,18 +285,26 @@ class Radio:
         json_path = self.tracks_dir / f"{base}.json"
 
         mp3_path.write_bytes(audio_bytes)
-        json_path.write_text(json.dumps(params, indent=2))
+        json_path.write_bytes(fastjson.dumps(params, indent=True))
 
         return mp3_path, json_path
 
     def mark_favorite(self, mp3_path: Path):
-        """Copy track + recipe to favorites/."""
+        """Hardlink track + copy recipe to favorites/."""
         dest_mp3 = self.favorites_dir / mp3_path.name
         dest_json = self.favorites_dir / mp3_path.with_suffix(".json").name
 
         src_json = mp3_path.with_suffix(".json")
 
-        shutil.copy2(mp3_path, dest_mp3)
+        # The mp3 is written once and never modified, so a hardlink is safe and
+        # costs no copy. The recipe is rewritten in place by update_recipe(),
+        # so it gets a real copy to keep the favorite's snapshot independent.
+        if not (dest_mp3.exists() and dest_mp3.samefile(mp3_path)):
+            dest_mp3.unlink(missing_ok=True)
+            try:
+                os.link(mp3_path, dest_mp3)
+            except OSError:  # cross-device or no hardlink support
+                shutil.copy2(mp3_path, dest_mp3)
         if src_json.exists():
             shutil.copy2(src_json, dest_json)
 
@@ -175,19 +312,23 @@ class Radio:
 
     def get_tracks(self, filter_by: str = "all") -> list[Path]:
         """filter_by: 'all' | 'favorites'"""
-        if filter_by == "favorites":
-            return sorted(self.favorites_dir.glob("*.mp3"))
-        return sorted(self.tracks_dir.glob("*.mp3"))
+        directory = self.favorites_dir if filter_by == "favorites" else self.tracks_dir
+        return sorted(Path(e.path) for e in _mp3_entries(directory))
+
+    def _track_stats(self) -> tuple[int, float]:
+        return _mp3_dir_stats(self.tracks_dir)
 
     def get_track_count(self) -> int:
-        return len(list(self.tracks_dir.glob("*.mp3")))
+        return self._track_stats()[0]
+
+    def get_favorite_count(self) -> int:
+        return _mp3_dir_stats(self.favorites_dir)[0]
 
     def get_last_played_fmt(self) -> str:
         """Return human-readable 'last played' string, e.g. '2h ago' or 'never'."""
-        tracks = sorted(self.tracks_dir.glob("*.mp3"), key=lambda p: p.stat().st_mtime)
-        if not tracks:
+        count, mtime = self._track_stats()
+        if not count:
             return "never"
-        mtime = tracks[-1].stat().st_mtime
         delta = time.time() - mtime
         if delta < 60:
             return "just now"
@@ -202,38 +343,44 @@ class Radio:
 
     def get_history(self, limit: int = 10) -> list[dict]:
         """Return last N tracks with their recipe data."""
-        mp3s = sorted(self.tracks_dir.glob("*.mp3"), key=lambda p: p.stat().st_mtime)
         result = []
-        for mp3 in mp3s[-limit:]:
-            recipe_path = mp3.with_suffix(".json")
-            if recipe_path.exists():
+        for name, recipe_path in _newest_tracks(self.tracks_dir, limit):
+            if recipe_path is not None:
                 try:
-                    recipe = json.loads(recipe_path.read_text())
-                    recipe["filename"] = mp3.name
+                    recipe = fastjson.loads(Path(recipe_path).read_bytes())
+                    recipe["filename"] = name
                     result.append(recipe)
-                except json.JSONDecodeError:
+                except fastjson.JSONDecodeError:
                     pass
-        return list(reversed(result))
+        return result
 
     def get_favorites(self, limit: int = 50) -> list[dict]:
         """Return saved favorites with their recipe data."""
-        mp3s = sorted(self.favorites_dir.glob("*.mp3"), key=lambda p: p.stat().st_mtime)
         result = []
-        for mp3 in mp3s[-limit:]:
-            recipe_path = mp3.with_suffix(".json")
-            recipe: dict = {"filename": mp3.name, "tags": mp3.stem, "reaction": "liked"}
-            if recipe_path.exists():
+        for name, recipe_path in _newest_tracks(self.favorites_dir, limit):
+            recipe: dict = {"filename": name, "tags": name[:-4], "reaction": "liked"}
+            if recipe_path is not None:
                 try:
-                    recipe = json.loads(recipe_path.read_text())
-                    recipe["filename"] = mp3.name
-                except json.JSONDecodeError:
+                    recipe = fastjson.loads(Path(recipe_path).read_bytes())
+                    recipe["filename"] = name
+                except fastjson.JSONDecodeError:
                     pass
             result.append(recipe)
-        return list(reversed(result))
+        return result
 
     def disk_free_mb(self) -> float:
-        stat = shutil.disk_usage(self.tracks_dir)
-        return stat.free / (1024 * 1024)
+        now = time.monotonic()
+        cached = _disk_cache.get(self.tracks_dir)
+        if cached is not None and now - cached[0] < _DISK_TTL_S:
+            return cached[1]
+        free_mb = shutil.disk_usage(self.tracks_dir).free / (1024 * 1024)
+        _disk_cache[self.tracks_dir] = (now, free_mb)
+        return free_mb
+
+
+# name → Radio, shared by every RadioManager so per-radio caches (parsed taste
+# profile) survive across requests instead of being rebuilt per Radio(name)
+_radio_cache: dict[str, "Radio"] = {}
 
 
 class RadioManager:
@@ -241,30 +388,36 @@ class RadioManager:
         RADIOS_DIR.mkdir(parents=True, exist_ok=True)
 
     def list_radios(self) -> list[str]:
-        return sorted(
-            d.name for d in RADIOS_DIR.iterdir()
-            if d.is_dir() and not d.name.startswith(".")
-        )
+        with os.scandir(RADIOS_DIR) as it:
+            return sorted(
+                e.name for e in it
+                if e.is_dir() and not e.name.startswith(".")
+            )
 
     def get_radio(self, name: str) -> Radio:
-        return Radio(name)
+        """Cached Radio for name; rebuilt (recreating its dirs) if the radio was removed."""
+        radio = _radio_cache.get(name)
+        if radio is None or not radio.path.is_dir():
+            radio = _radio_cache[name] = Radio(name)
+        return radio
 
     def current_radio(self) -> Radio:
         if _CURRENT_FILE.exists():
             name = _CURRENT_FILE.read_text().strip()
             if name and (RADIOS_DIR / name).is_dir():
-                return Radio(name)
+                return self.get_radio(name)
         # Default to "default"
-        radio = Radio("default")
+        radio = self.get_radio("default")
         self._set_current(radio.name)
         return radio
 
     def switch_to(self, name: str) -> Radio:
-        radio = Radio(name)  # creates dirs if new
+        radio = self.get_radio(name)  # creates dirs if new
         self._set_current(name)
         return radio
 
     def delete(self, name: str):
+        _radio_cache.pop(name, None)
         path = RADIOS_DIR / name
         if path.exists():
             shutil.rmtree(path)
@@ -276,11 +429,12 @@ class RadioManager:
         _CURRENT_FILE.write_text(name)
 
 
+_SLUG_DROP_RE = re.compile(r"[^\w\s-]")
+_SLUG_DASH_RE = re.compile(r"[\s,]+")
+
+
 def _slugify(text: str) -> str:
     """Convert tags string to a filename-safe slug."""
-    import re
-    slug = text.lower()
-    slug = re.sub(r"[^\w\s-]", "", slug)
-    slug = re.sub(r"[\s,]+", "-", slug)
-    slug = slug.strip("-")
-    return slug
+    slug = _SLUG_DROP_RE.sub("", text.lower())
+    slug = _SLUG_DASH_RE.sub("-", slug)
+    return slug.strip("-")
@@ -1,18 +1,150 @@
 """Module 6 — Virtual Playback Tracker (browser plays the audio via PWA)"""
 import asyncio
+import os
 import re
 import subprocess
 import time
 from pathlib import Path
 from typing import Optional
 
+from . import fastjson
+
+_FFPROBE_ARGS = ("ffprobe", "-v", "quiet", "-show_entries", "format=duration", "-of", "csv=p=0")
+_AFINFO_DURATION_RE = re.compile(r"estimated duration:\s+([\d.]+)\s+sec")
+
+# (path, mtime_ns) → seconds. Tracks are written once, so a probe result stays
+# valid until the file itself changes.
+_duration_cache: dict[tuple[str, int], float] = {}
+
+
+def _duration_key(path: Path) -> Optional[tuple[str, int]]:
+    try:
+        return str(path), path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _known_duration(path: Path, key: Optional[tuple[str, int]]) -> float | None:
+    """Duration from the in-process cache, else from the recipe's audio_duration_s."""
+    if key is None:
+        return None
+    if key in _duration_cache:
+        return _duration_cache[key]
+    try:
+        dur = fastjson.loads(path.with_suffix(".json").read_bytes()).get("audio_duration_s")
+    except (OSError, fastjson.JSONDecodeError, AttributeError):
+        return None
+    if isinstance(dur, (int, float)) and dur > 0:
+        _duration_cache[key] = float(dur)
+        return float(dur)
+    return None
+
+
+# ── MP3 header reader (no subprocess for the files ACE-Step produces) ────────
+
+# Layer III bitrates in kbps, by bitrate index (0 = free, 15 = bad)
+_MP3_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_MP3_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+# Sample rates by version bits: 0 = MPEG 2.5, 2 = MPEG 2, 3 = MPEG 1
+_MP3_SAMPLE_RATES = {0: (11025, 12000, 8000), 2: (22050, 24000, 16000), 3: (44100, 48000, 32000)}
+
+
+def _mp3_header_duration(path: Path) -> float | None:
+    """Duration of a Layer III MP3 from its headers, or None if it can't be read.
+
+    A sync word only counts as a frame header if a second header follows it
+    at the computed frame length. Uses the Xing/Info or VBRI frame count when
+    present (exact for VBR), otherwise assumes CBR and divides the audio byte
+    size, less any trailing ID3v1 tag, by the bitrate.
+    """
+    try:
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            head = f.read(10)
+            start = 0
+            if head[:3] == b"ID3" and len(head) == 10:
+                start = 10 + ((head[6] & 0x7F) << 21 | (head[7] & 0x7F) << 14
+                              | (head[8] & 0x7F) << 7 | (head[9] & 0x7F))
+                if head[5] & 0x10:  # footer present
+                    start += 10
+            f.seek(start)
+            buf = f.read(8192)
+            if size - start >= 128:
+                f.seek(size - 128)
+                if f.read(3) == b"TAG":  # ID3v1 trailer — not audio
+                    size -= 128
+    except OSError:
+        return None
+
+    for i in range(len(buf) - 4):
+        if buf[i] != 0xFF or buf[i + 1] & 0xE0 != 0xE0:
+            continue
+        b1, b2, b3 = buf[i + 1], buf[i + 2], buf[i + 3]
+        version, layer = (b1 >> 3) & 3, (b1 >> 1) & 3
+        br_idx, sr_idx = b2 >> 4, (b2 >> 2) & 3
+        if version == 1 or layer != 1 or br_idx in (0, 15) or sr_idx == 3:
+            continue  # reserved / not Layer III / free-format — keep scanning
+        mpeg1 = version == 3
+        bitrate = (_MP3_BITRATES_V1 if mpeg1 else _MP3_BITRATES_V2)[br_idx] * 1000
+        sample_rate = _MP3_SAMPLE_RATES[version][sr_idx]
+        samples_per_frame = 1152 if mpeg1 else 576
+        mono = (b3 >> 6) == 3
+
+        # Confirm with the next frame header: same sync, version, layer and rate
+        frame_len = (144 if mpeg1 else 72) * bitrate // sample_rate + ((b2 >> 1) & 1)
+        nxt = i + frame_len
+        if (nxt + 4 > len(buf) or buf[nxt] != 0xFF
+                or buf[nxt + 1] & 0xFE != b1 & 0xFE or (buf[nxt + 2] ^ b2) & 0x0C):
+            continue
+
+        # Xing/Info sits right after the side info; VBRI at a fixed 32-byte offset
+        xing = i + 4 + ((17 if mono else 32) if mpeg1 else (9 if mono else 17))
+        if buf[xing:xing + 4] in (b"Xing", b"Info") and len(buf) >= xing + 12 and buf[xing + 7] & 1:
+            frames = int.from_bytes(buf[xing + 8:xing + 12], "big")
+            if frames:
+                return frames * samples_per_frame / sample_rate
+        vbri = i + 36
+        if buf[vbri:vbri + 4] == b"VBRI":
+            frames = int.from_bytes(buf[vbri + 14:vbri + 18], "big")
+            if frames:
+                return frames * samples_per_frame / sample_rate
+
+        audio_bytes = size - start - i
+        return audio_bytes * 8 / bitrate if audio_bytes > 0 else None
+    return None
+
 
 def get_audio_duration(path: Path) -> float | None:
-    """Get audio duration in seconds. Tries ffprobe first (accurate), falls back to afinfo."""
+    """Get audio duration in seconds — cached per file, probed only on a miss."""
+    key = _duration_key(path)
+    dur = _known_duration(path, key)
+    if dur is None:
+        dur = _probe_duration(path)
+        if dur is not None and key is not None:
+            _duration_cache[key] = dur
+    return dur
+
+
+async def get_audio_duration_async(path: Path) -> float | None:
+    """get_audio_duration() without blocking the event loop on the probe process."""
+    key = _duration_key(path)
+    dur = _known_duration(path, key)
+    if dur is None:
+        dur = await _probe_duration_async(path)
+        if dur is not None and key is not None:
+            _duration_cache[key] = dur
+    return dur
+
+
+def _probe_duration(path: Path) -> float | None:
+    """Reads MP3 headers in-process; otherwise tries ffprobe (accurate), then afinfo."""
+    if path.suffix.lower() == ".mp3":
+        dur = _mp3_header_duration(path)
+        if dur is not None:
+            return dur
     try:
         result = subprocess.run(
-            ["ffprobe", "-v", "quiet", "-show_entries", "format=duration",
-             "-of", "csv=p=0", str(path)],
+            [*_FFPROBE_ARGS, str(path)],
             capture_output=True, text=True, timeout=5,
         )
         if result.returncode == 0 and result.stdout.strip():
@@ -25,7 +157,44 @@ def get_audio_duration(path: Path) -> float | None:
             ["afinfo", str(path)],
             capture_output=True, text=True, timeout=5,
         )
-        match = re.search(r"estimated duration:\s+([\d.]+)\s+sec", result.stdout)
+        match = _AFINFO_DURATION_RE.search(result.stdout)
+        return float(match.group(1)) if match else None
+    except Exception:
+        return None
+
+
+async def _run_probe(*cmd: str) -> tuple[int, str]:
+    """Run a probe command on the event loop's child watcher — no executor thread.
+
+    Raises OSError if the binary is missing, asyncio.TimeoutError after 5s.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        out, _ = await asyncio.wait_for(proc.communicate(), timeout=5)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, out.decode(errors="replace")
+
+
+async def _probe_duration_async(path: Path) -> float | None:
+    if path.suffix.lower() == ".mp3":
+        dur = _mp3_header_duration(path)
+        if dur is not None:
+            return dur
+    try:
+        returncode, out = await _run_probe(*_FFPROBE_ARGS, str(path))
+        if returncode == 0 and out.strip():
+            return float(out.strip())
+    except Exception:
+        pass
+
+    try:
+        _, out = await _run_probe("afinfo", str(path))
+        match = _AFINFO_DURATION_RE.search(out)
         return float(match.group(1)) if match else None
     except Exception:
         return None
@@ -39,11 +208,11 @@ class Player:
         self._source: Optional[Path] = None
         self._paused: bool = False
         self._volume: int = 80
-        self._play_start: float = 0.0
+        # Monotonic time at which position 0 would have played; moved only on
+        # pause/resume/seek so reading elapsed is a single subtraction
+        self._origin: float = 0.0
+        self._paused_pos: float = 0.0
         self._duration: Optional[float] = None
-        self._paused_at: float = 0.0
-        self._total_paused: float = 0.0
-        self._seek_offset: float = 0.0
         self._done_event: asyncio.Event = asyncio.Event()
         self._watcher_task: Optional[asyncio.Task] = None
 
@@ -56,11 +225,9 @@ class Player:
         self._current = path
         self._source = path
         self._paused = False
-        self._play_start = time.monotonic()
+        self._origin = time.monotonic()
+        self._paused_pos = 0.0
         self._duration = duration
-        self._paused_at = 0.0
-        self._total_paused = 0.0
-        self._seek_offset = 0.0
         self._start_watcher(duration)
 
     def stop(self):
@@ -70,25 +237,21 @@ class Player:
         self._current = None
         self._source = None
         self._paused = False
-        self._play_start = 0.0
+        self._origin = 0.0
+        self._paused_pos = 0.0
         self._duration = None
-        self._paused_at = 0.0
-        self._total_paused = 0.0
-        self._seek_offset = 0.0
 
     def pause(self):
         """Pause virtual playback."""
         if self._current and not self._paused:
+            self._paused_pos = self.elapsed
             self._paused = True
-            self._paused_at = time.monotonic()
             self._cancel_watcher()
 
     def resume(self):
         """Resume virtual playback from paused position."""
         if self._current and self._paused:
-            if self._paused_at > 0:
-                self._total_paused += time.monotonic() - self._paused_at
-                self._paused_at = 0.0
+            self._origin = time.monotonic() - self._paused_pos
             self._paused = False
             if self._duration is not None:
                 remaining = self._duration - self.elapsed
@@ -135,10 +298,8 @@ class Player:
 
         self._cancel_watcher()
         self._done_event = asyncio.Event()
-        self._seek_offset = new_pos
-        self._play_start = time.monotonic()
-        self._paused_at = 0.0
-        self._total_paused = 0.0
+        self._origin = time.monotonic() - new_pos
+        self._paused_pos = new_pos
 
         if not self._paused and self._duration is not None:
             remaining = self._duration - new_pos
@@ -168,13 +329,11 @@ class Player:
     @property
     def elapsed(self) -> float:
         """Seconds elapsed in current playback, accounting for pauses and seeks."""
-        if self._play_start == 0:
+        if self._origin == 0:
             return 0.0
-        if self._paused and self._paused_at > 0:
-            raw = self._paused_at - self._play_start - self._total_paused
-        else:
-            raw = time.monotonic() - self._play_start - self._total_paused
-        return self._seek_offset + raw
+        if self._paused:
+            return self._paused_pos
+        return time.monotonic() - self._origin
 
     @property
     def duration(self) -> Optional[float]:
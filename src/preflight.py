@@ -3,57 +3,84 @@ import asyncio
 import logging
 import subprocess
 import os
+import shutil
+import time
 from pathlib import Path
+from typing import Optional
 
 import httpx
 
-from .config import OLLAMA_HOST, OLLAMA_MODEL, ACESTEP_HOST
+from .config import (
+    OLLAMA_HOST, OLLAMA_MODEL, ACESTEP_HOST, PREFLIGHT_HTTP_TIMEOUT,
+    ACESTEP_BOOT_TIMEOUT, ACESTEP_POLL_MIN, ACESTEP_POLL_MAX,
+)
 from .acestep import ensure_model
+from . import fastjson
 
 logger = logging.getLogger(__name__)
 
 
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for health probes (created lazily inside the running loop)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=PREFLIGHT_HTTP_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=30),
+        )
+    return _client
+
+
+async def close_client():
+    """Close the shared probe client (called on server shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
 async def check_ollama() -> dict:
     """Check if Ollama is running and has the required model."""
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            r = await client.get(f"{OLLAMA_HOST}/api/tags")
-            if r.status_code == 200:
-                models = [m["name"] for m in r.json().get("models", [])]
-                has_model = any(
-                    m == OLLAMA_MODEL or m.startswith(OLLAMA_MODEL.split(":")[0])
-                    for m in models
-                )
-                return {
-                    "ok": True,
-                    "model": OLLAMA_MODEL,
-                    "model_available": has_model,
-                }
+        r = await get_client().get(f"{OLLAMA_HOST}/api/tags")
+        if r.status_code == 200:
+            models = [m["name"] for m in fastjson.loads(r.content).get("models", [])]
+            has_model = any(
+                m == OLLAMA_MODEL or m.startswith(OLLAMA_MODEL.split(":")[0])
+                for m in models
+            )
+            return {
+                "ok": True,
+                "model": OLLAMA_MODEL,
+                "model_available": has_model,
+            }
+        return {"ok": False, "error": f"HTTP {r.status_code}"}
     except Exception as e:
-        pass
-    return {"ok": False, "error": "Ollama not responding"}
+        return {"ok": False, "error": str(e) or "Ollama not responding"}
 
 
 async def check_acestep() -> dict:
     """Check if ACE-Step server is running."""
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            r = await client.get(f"{ACESTEP_HOST}/health")
-            if r.status_code == 200:
-                return {"ok": True}
-    except Exception:
-        pass
-    return {"ok": False, "error": "ACE-Step not responding"}
+        r = await get_client().get(f"{ACESTEP_HOST}/health")
+        if r.status_code == 200:
+            return {"ok": True}
+        return {"ok": False, "error": f"HTTP {r.status_code}"}
+    except Exception as e:
+        return {"ok": False, "error": str(e) or "ACE-Step not responding"}
 
 
-async def try_start_acestep() -> bool:
-    """Attempt to auto-start ACE-Step. Returns True if it starts successfully."""
-    acestep_dir = Path.home() / "ACE-Step"
-    if not acestep_dir.exists():
-        return False
+_uv_path: Optional[str] = None
+
 
-    # Find uv
-    uv_path = None
+def _find_uv() -> Optional[str]:
+    """Locate the uv executable; a hit is remembered for the process lifetime."""
+    global _uv_path
+    if _uv_path and os.access(_uv_path, os.X_OK):
+        return _uv_path
     for candidate in [
         Path.home() / ".local/bin/uv",
         Path.home() / ".cargo/bin/uv",
@@ -61,17 +88,28 @@ async def try_start_acestep() -> bool:
         Path("/usr/local/bin/uv"),
     ]:
         if candidate.exists():
-            uv_path = str(candidate)
-            break
+            _uv_path = str(candidate)
+            return _uv_path
+    _uv_path = shutil.which("uv")  # single PATH walk for non-standard installs
+    return _uv_path
+
+
+async def try_start_acestep() -> bool:
+    """Attempt to auto-start ACE-Step. Returns True if it starts successfully."""
+    acestep_dir = Path.home() / "ACE-Step"
+    if not acestep_dir.exists():
+        return False
 
+    uv_path = _find_uv()
     if not uv_path:
         return False
 
     logger.info("Auto-starting ACE-Step...")
-    env = os.environ.copy()
-    env["ACESTEP_LM_BACKEND"] = "mlx"
-    env["ACESTEP_INIT_LLM"] = "true"
-    env["TOKENIZERS_PARALLELISM"] = "false"
+    env = os.environ | {
+        "ACESTEP_LM_BACKEND": "mlx",
+        "ACESTEP_INIT_LLM": "true",
+        "TOKENIZERS_PARALLELISM": "false",
+    }
     subprocess.Popen(
         [uv_path, "run", "acestep-api", "--host", "127.0.0.1", "--port", "8001",
          "--lm-model-path", "acestep-5Hz-lm-4B"],
@@ -81,15 +119,19 @@ async def try_start_acestep() -> bool:
         stderr=subprocess.DEVNULL,
     )
 
-    # Wait up to 180s
-    for elapsed in range(180):
-        await asyncio.sleep(1)
+    # Wait up to ACESTEP_BOOT_TIMEOUT — one keep-alive client for every health
+    # poll. Backoff starts short so a fast start is seen quickly, then settles.
+    client = get_client()
+    start = time.monotonic()
+    attempt = 0
+    while time.monotonic() - start < ACESTEP_BOOT_TIMEOUT:
+        await asyncio.sleep(min(ACESTEP_POLL_MAX, ACESTEP_POLL_MIN * 1.5 ** attempt))
+        attempt += 1
         try:
-            async with httpx.AsyncClient(timeout=2) as client:
-                r = await client.get(f"{ACESTEP_HOST}/health")
-                if r.status_code == 200:
-                    logger.info("ACE-Step auto-started after %ds", elapsed)
-                    return True
+            r = await client.get(f"{ACESTEP_HOST}/health", timeout=2)
+            if r.status_code == 200:
+                logger.info("ACE-Step auto-started after %.1fs", time.monotonic() - start)
+                return True
         except Exception:
             pass
 
@@ -98,8 +140,8 @@ async def try_start_acestep() -> bool:
 
 async def run_preflight() -> dict:
     """Run all startup checks. Returns dict of check results."""
-    ollama = await check_ollama()
-    acestep = await check_acestep()
+    # Independent probes — total latency is the slowest check, not the sum
+    ollama, acestep = await asyncio.gather(check_ollama(), check_acestep())
 
     if not acestep["ok"]:
         started = await try_start_acestep()
@@ -1,6 +1,95 @@
 """Module 3 — Reaction Parser (keyword matching, no LLM)"""
+import functools
 import re
-from typing import Optional
+
+# ── Patterns (compiled once at import; parse_reaction runs on every reaction) ──
+
+_QUIT_RE = re.compile(r"\bquit\b|\bexit\b|\bbye\b")
+
+# Radio management
+_LIST_RADIOS_RE = re.compile(r"(what radios|list radios|my radios|show radios|\bradios\b)")
+_SWITCH_RE = re.compile(
+    r"(?:switch to|change to|go to|use)\s+(?:my\s+)?(?:the\s+)?(.+?)(?:\s+radio)?$"
+)
+_CREATE_RE = re.compile(
+    r"(?:create|new|start|make)\s+(?:a\s+)?(?:radio\s+(?:called\s+|named\s+)?|new\s+radio\s+(?:called\s+|named\s+)?)(.+?)(?:\s+radio)?$"
+)
+_DELETE_SUFFIX_RE = re.compile(r"(?:delete|remove|kill)\s+(?:the\s+)?(?:my\s+)?(.+?)\s+radio$")
+_DELETE_PREFIX_RE = re.compile(r"(?:delete|remove|kill)\s+(?:the\s+)?(?:my\s+)?radio\s+(.+?)$")
+
+# Commands — one alternation, one scan. When several match, the later entry
+# wins (help > open_folder > share > history > what > save).
+_COMMAND_ORDER = ("save", "what", "history", "share", "open_folder", "help")
+_COMMAND_RE = re.compile("|".join(f"(?P<{name}>{pat})" for name, pat in zip(_COMMAND_ORDER, (
+    r"\bsave\b|\bkeep\b|\bfavorite\b|\bfav\b",
+    r"what is this|what's this|\binfo\b|\brecipe\b|\bparams\b|\bdetails\b",
+    r"\bhistory\b|\blast played\b|\brecent\b|\btracks\b|\bsongs\b",
+    r"\bshare\b",
+    r"open folder|open in finder|\bfinder\b",
+    r"^\s*help\s*$",
+))))
+
+# Sleep timer
+_CANCEL_SLEEP_RE = re.compile(r"cancel\s+sleep")
+_SLEEP_OFF_RE = re.compile(r"^\s*sleep\s+off\s*$")
+_SLEEP_FOR_RE = re.compile(r"^\s*sleep\s+(\d+)\s*(h|m|min|mins|hours?)?\s*$")
+_SLEEP_STATUS_RE = re.compile(r"^\s*sleep\s*$")
+
+# Signal
+_LOVE_RE = re.compile(
+    r"\blove\b|\bperfect\b|\bamazing\b|\bincredible\b|\bfire\b|\byes\b"
+    r"|❤️|🔥|💯|\bgreat\b|\bawesome\b|\bbanging\b|\bbanger\b"
+)
+_DISLIKE_RE = re.compile(r"\bhate\b|\bterrible\b|\bawful\b|\bnope\b|\bdislike\b|\bno+\b")
+_SKIP_RE = re.compile(r"\bskip\b|\bnext\b|\bpass\b|\bnot this\b")
+_LIKE_WORDS = frozenset({"good", "like", "nice", "cool", "solid", "okay", "ok", "fresh"})
+
+# Direction
+_RESET_RE = re.compile(
+    r"something (?:completely )?different|change it up|\breset\b|surprise me|totally different"
+)
+_TWEAK_RE = re.compile(r"more like this|similar|\bkeep it\b|\bstay\b|same vibe")
+
+# Modifiers — capture "more/less/add/remove/no X". All patterns run in one
+# scan: the alternation sits inside a lookahead, so every start position is
+# tried without consuming text and overlapping hits from different patterns
+# (e.g. "no more bass") are all still seen. Group 2k+1 wraps pattern k and
+# group 2k+2 is its capture.
+_MODIFIER_PATTERNS = (
+    r"\bmore\s+([\w ]{2,25}?)(?=\s*(?:and|,|$))",
+    r"\bless\s+([\w ]{2,25}?)(?=\s*(?:and|,|$))",
+    r"\badd\s+([\w ]{2,25}?)(?=\s*(?:and|,|$))",
+    r"\bremove\s+([\w ]{2,25}?)(?=\s*(?:and|,|$))",
+    r"\bno\s+([\w ]{2,25}?)(?=\s*(?:and|,|$))",
+    r"\b(faster|slower|louder|quieter|harder|softer|heavier|lighter|darker|brighter|rawer|smoother)\b",
+    r"\bturn\s+up\s+(?:the\s+)?([\w ]{2,25}?)(?=\s*(?:and|,|$))",     # "turn up the bass"
+    r"\bturn\s+down\s+(?:the\s+)?([\w ]{2,25}?)(?=\s*(?:and|,|$))",   # "turn down the vocals"
+    r"\bmake\s+it\s+(?:sound\s+)?([\w ]{2,25}?)(?=\s*(?:and|,|$))",   # "make it sound darker"
+)
+_MODIFIER_RE = re.compile("(?=" + "|".join(f"({p})" for p in _MODIFIER_PATTERNS) + ")")
+
+# Natural phrasing normalization
+_PHRASE_RES = [
+    (re.compile(r"\bspeed\s*(?:it\s+)?up\b"), "faster"),
+    (re.compile(r"\bslow\s*(?:it\s+)?down\b"), "slower"),
+]
+
+# Mood — whole-word keywords; the first mood (in this order) with a hit wins
+_MOOD_WORDS = (
+    ("focus",  frozenset({"focus", "work", "concentrate", "study"})),
+    ("energy", frozenset({"energy", "pump", "workout", "hype", "intense"})),
+    ("chill",  frozenset({"chill", "relax", "soothe", "easy", "mellow"})),
+    ("sad",    frozenset({"sad", "melancholy", "depressing", "emotion"})),
+    ("happy",  frozenset({"happy", "joyful", "uplifting", "upbeat"})),
+    ("sleep",  frozenset({"sleep", "dream", "night"})),
+    ("party",  frozenset({"party", "club", "rave"})),
+)
+
+# \bword\b matches exactly when word is one of these tokens
+_WORD_RE = re.compile(r"\w+")
+
+_RADIO_NAME_DROP_RE = re.compile(r"[^\w\s-]")
+_RADIO_NAME_DASH_RE = re.compile(r"\s+")
 
 
 def parse_reaction(text: str) -> dict:
@@ -18,7 +107,14 @@ def parse_reaction(text: str) -> dict:
         "raw":        original text,
     }
     """
-    t = text.strip().lower()
+    parsed = _parse_normalized(text.strip().lower())
+    return {**parsed, "modifiers": list(parsed["modifiers"]), "raw": text}
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_normalized(t: str) -> dict:
+    """Parse lowercased, stripped text. Cached: users repeat the same few
+    reactions, so hits skip every regex. Callers must copy the result."""
     result: dict = {
         "signal": None,
         "direction": None,
@@ -26,38 +122,35 @@ def parse_reaction(text: str) -> dict:
         "mood": None,
         "command": None,
         "radio_name": None,
-        "raw": text,
+        "raw": None,
     }
 
     if not t:
         return result
 
     # ── Quit (checked first, high priority) ───────────────────────────────────
-    if re.search(r"\bquit\b|\bexit\b|\bbye\b", t):
+    # Cheap substring gates (`in` is a C memmem) skip regexes that cannot match
+    if ("quit" in t or "exit" in t or "bye" in t) and _QUIT_RE.search(t):
         result["command"] = "quit"
         return result
 
     # ── Radio management (checked before general commands) ────────────────────
 
     # list radios
-    if re.search(r"(what radios|list radios|my radios|show radios|\bradios\b)", t):
+    has_radio = "radio" in t
+    if has_radio and _LIST_RADIOS_RE.search(t):
         result["command"] = "list_radios"
         return result
 
     # switch to X / go to X / change to X
-    switch_match = re.search(
-        r"(?:switch to|change to|go to|use)\s+(?:my\s+)?(?:the\s+)?(.+?)(?:\s+radio)?$", t
-    )
+    switch_match = _SWITCH_RE.search(t)
     if switch_match:
         result["command"] = "switch_radio"
         result["radio_name"] = _clean_radio_name(switch_match.group(1))
         return result
 
     # create / new radio named X
-    create_match = re.search(
-        r"(?:create|new|start|make)\s+(?:a\s+)?(?:radio\s+(?:called\s+|named\s+)?|new\s+radio\s+(?:called\s+|named\s+)?)(.+?)(?:\s+radio)?$",
-        t,
-    )
+    create_match = _CREATE_RE.search(t)
     if create_match:
         result["command"] = "create_radio"
         result["radio_name"] = _clean_radio_name(create_match.group(1))
@@ -65,11 +158,7 @@ def parse_reaction(text: str) -> dict:
 
     # delete / remove radio X — require "radio" keyword to avoid collision
     # with modifiers like "remove vocals" or "kill the beat"
-    delete_match = re.search(
-        r"(?:delete|remove|kill)\s+(?:the\s+)?(?:my\s+)?(.+?)\s+radio$", t
-    ) or re.search(
-        r"(?:delete|remove|kill)\s+(?:the\s+)?(?:my\s+)?radio\s+(.+?)$", t
-    )
+    delete_match = has_radio and (_DELETE_SUFFIX_RE.search(t) or _DELETE_PREFIX_RE.search(t))
     if delete_match:
         result["command"] = "delete_radio"
         result["radio_name"] = _clean_radio_name(delete_match.group(1))
@@ -77,130 +166,113 @@ def parse_reaction(text: str) -> dict:
 
     # ── Commands ──────────────────────────────────────────────────────────────
 
-    if re.search(r"\bsave\b|\bkeep\b|\bfavorite\b|\bfav\b", t):
-        result["command"] = "save"
-        result["signal"] = "liked"  # saving implies liking
-
-    if re.search(r"what is this|what's this|\binfo\b|\brecipe\b|\bparams\b|\bdetails\b", t):
-        result["command"] = "what"
-
-    if re.search(r"\bhistory\b|\blast played\b|\brecent\b|\btracks\b|\bsongs\b", t):
-        result["command"] = "history"
-
-    if re.search(r"\bshare\b", t):
-        result["command"] = "share"
-
-    if re.search(r"open folder|open in finder|\bfinder\b", t):
-        result["command"] = "open_folder"
-
-    if re.search(r"^\s*help\s*$", t):
-        result["command"] = "help"
+    commands = {m.lastgroup for m in _COMMAND_RE.finditer(t)}
+    if commands:
+        if "save" in commands:
+            result["signal"] = "liked"  # saving implies liking
+        result["command"] = next(c for c in reversed(_COMMAND_ORDER) if c in commands)
 
     # ── Sleep timer ────────────────────────────────────────────────────────
-    if re.search(r"cancel\s+sleep", t):
-        result["command"] = "cancel_sleep"
-        return result
-
-    sleep_match = re.match(r"^\s*sleep\s+off\s*$", t)
-    if sleep_match:
-        result["command"] = "cancel_sleep"
-        return result
-
-    sleep_dur = re.match(r"^\s*sleep\s+(\d+)\s*(h|m|min|mins|hours?)?\s*$", t)
-    if sleep_dur:
-        amount = int(sleep_dur.group(1))
-        unit = (sleep_dur.group(2) or "m").lower()
-        if unit.startswith("h"):
-            result["timer_minutes"] = amount * 60
-        else:
-            result["timer_minutes"] = amount
-        result["command"] = "sleep_timer"
-        return result
-
-    if re.match(r"^\s*sleep\s*$", t):
-        result["command"] = "sleep_status"
-        return result
+    if "sleep" in t:
+        if _CANCEL_SLEEP_RE.search(t):
+            result["command"] = "cancel_sleep"
+            return result
+
+        sleep_match = _SLEEP_OFF_RE.match(t)
+        if sleep_match:
+            result["command"] = "cancel_sleep"
+            return result
+
+        sleep_dur = _SLEEP_FOR_RE.match(t)
+        if sleep_dur:
+            amount = int(sleep_dur.group(1))
+            unit = (sleep_dur.group(2) or "m").lower()
+            if unit.startswith("h"):
+                result["timer_minutes"] = amount * 60
+            else:
+                result["timer_minutes"] = amount
+            result["command"] = "sleep_timer"
+            return result
+
+        if _SLEEP_STATUS_RE.match(t):
+            result["command"] = "sleep_status"
+            return result
 
     # ── Signal ────────────────────────────────────────────────────────────────
 
-    if re.search(
-        r"\blove\b|\bperfect\b|\bamazing\b|\bincredible\b|\bfire\b|\byes\b"
-        r"|❤️|🔥|💯|\bgreat\b|\bawesome\b|\bbanging\b|\bbanger\b",
-        t,
-    ):
+    words = set(_WORD_RE.findall(t))
+
+    if _LOVE_RE.search(t):
         result["signal"] = "liked"
-    elif re.search(r"\bhate\b|\bterrible\b|\bawful\b|\bnope\b|\bdislike\b|\bno+\b", t):
+    elif _DISLIKE_RE.search(t):
         result["signal"] = "disliked"
-    elif re.search(r"\bskip\b|\bnext\b|\bpass\b|\bnot this\b", t):
+    elif _SKIP_RE.search(t):
         result["signal"] = "skipped"
-    elif re.search(r"\bgood\b|\blike\b|\bnice\b|\bcool\b|\bsolid\b|\bokay\b|\bok\b|\bfresh\b", t):
+    elif not words.isdisjoint(_LIKE_WORDS):
         result["signal"] = "liked"
 
     # ── Direction ─────────────────────────────────────────────────────────────
 
-    if re.search(
-        r"something (?:completely )?different|change it up|\breset\b|surprise me|totally different",
-        t,
-    ):
+    if _RESET_RE.search(t):
         result["direction"] = "reset"
-    elif re.search(r"more like this|similar|\bkeep it\b|\bstay\b|same vibe", t):
+    elif _TWEAK_RE.search(t):
         result["direction"] = "tweak"
     elif result["signal"] or result["modifiers"]:
         result["direction"] = "tweak"
 
-    # ── Modifiers — capture "more/less/add/remove/no X" ──────────────────────
-
-    modifier_patterns = [
-        r"\bmore\s+([\w ]{2,25}?)(?=\s*(?:and|,|$))",
-        r"\bless\s+([\w ]{2,25}?)(?=\s*(?:and|,|$))",
-        r"\badd\s+([\w ]{2,25}?)(?=\s*(?:and|,|$))",
-        r"\bremove\s+([\w ]{2,25}?)(?=\s*(?:and|,|$))",
-        r"\bno\s+([\w ]{2,25}?)(?=\s*(?:and|,|$))",
-        r"\b(faster|slower|louder|quieter|harder|softer|heavier|lighter|darker|brighter|rawer|smoother)\b",
-        r"\bturn\s+up\s+(?:the\s+)?([\w ]{2,25}?)(?=\s*(?:and|,|$))",     # "turn up the bass"
-        r"\bturn\s+down\s+(?:the\s+)?([\w ]{2,25}?)(?=\s*(?:and|,|$))",   # "turn down the vocals"
-        r"\bmake\s+it\s+(?:sound\s+)?([\w ]{2,25}?)(?=\s*(?:and|,|$))",   # "make it sound darker"
-    ]
+    # ── Modifiers ─────────────────────────────────────────────────────────────
+
+    # Bucket hits per pattern so the output keeps pattern order, and skip a
+    # hit that overlaps the previous one from the same pattern, as a separate
+    # finditer per pattern would.
+    hits: list[list[str]] = [[] for _ in _MODIFIER_PATTERNS]
+    ends = [0] * len(_MODIFIER_PATTERNS)
+    for m in _MODIFIER_RE.finditer(t):
+        outer = m.lastindex
+        k = outer >> 1
+        if m.start(outer) >= ends[k]:
+            ends[k] = m.end(outer)
+            hits[k].append(m.group(outer + 1))
+
     seen: set = set()
-    for pat in modifier_patterns:
-        for m in re.finditer(pat, t):
-            mod = m.group(1).strip()
+    for bucket in hits:
+        for raw in bucket:
+            mod = raw.strip()
             if mod and len(mod) < 40 and mod not in seen:
                 seen.add(mod)
                 result["modifiers"].append(mod)
 
-    # Natural phrasing normalization
-    _phrase_map = {
-        r"\bspeed\s*(?:it\s+)?up\b": "faster",
-        r"\bslow\s*(?:it\s+)?down\b": "slower",
-    }
-    for pat, replacement in _phrase_map.items():
-        if re.search(pat, t) and replacement not in seen:
-            seen.add(replacement)
-            result["modifiers"].append(replacement)
+    if "up" in t or "down" in t:
+        for pat, replacement in _PHRASE_RES:
+            if pat.search(t) and replacement not in seen:
+                seen.add(replacement)
+                result["modifiers"].append(replacement)
 
     # ── Mood ──────────────────────────────────────────────────────────────────
 
-    mood_map = {
-        "focus":  r"\bfocus\b|\bwork\b|\bconcentrate\b|\bstudy\b",
-        "energy": r"\benergy\b|\bpump\b|\bworkout\b|\bhype\b|\bfull energy\b|\bintense\b",
-        "chill":  r"\bchill\b|\brelax\b|\bsoothe\b|\beasy\b|\bmellow\b",
-        "sad":    r"\bsad\b|\bmelancholy\b|\bdepressing\b|\bemotion\b",
-        "happy":  r"\bhappy\b|\bjoyful\b|\buplifting\b|\bupbeat\b",
-        "sleep":  r"\bsleep\b|\bdream\b|\bnight\b",
-        "party":  r"\bparty\b|\bclub\b|\brave\b",
-    }
-    for mood, pat in mood_map.items():
-        if re.search(pat, t):
+    for mood, keywords in _MOOD_WORDS:
+        if not words.isdisjoint(keywords):
             result["mood"] = mood
             break
 
     return result
 
 
+# Single-word reactions dominate; warm the cache with them at import.
+for _word in (
+    "ok", "okay", "yes", "no", "nope", "good", "nice", "cool", "great", "love",
+    "fire", "perfect", "awesome", "hate", "skip", "next", "pass", "save", "keep",
+    "fav", "info", "history", "share", "help", "quit", "exit", "bye", "radios",
+    "reset", "faster", "slower", "louder", "quieter", "darker", "brighter",
+    "chill", "focus", "party", "sleep", "🔥", "❤️", "💯",
+):
+    _parse_normalized(_word)
+del _word
+
+
 def _clean_radio_name(raw: str) -> str:
     """Normalize a radio name to a filesystem-safe slug."""
     name = raw.strip().lower()
-    name = re.sub(r"[^\w\s-]", "", name)
-    name = re.sub(r"\s+", "-", name)
+    name = _RADIO_NAME_DROP_RE.sub("", name)
+    name = _RADIO_NAME_DASH_RE.sub("-", name)
     return name.strip("-")
@@ -6,11 +6,24 @@ Sourced from:
 - Ace-Step_Data-Tool config/prompts.json (category limits, max_total_tags)
 - ACE-Step 1.5 Tutorial.md (timbre/texture dimension, lyrics tags, caption structure)
 """
+import bisect
 import difflib
+import functools
+import hashlib
 import re
 import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from itertools import islice
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Iterable, Mapping
+
+try:
+    from rapidfuzz import fuzz as _rf_fuzz, process as _rf_process
+except ImportError:  # optional speed-up (pip install rapidfuzz) — difflib fallback below
+    _rf_process = None
+
+from .config import SEMANTIC_CACHE_DIR
 
 if TYPE_CHECKING:
     import numpy as np
@@ -110,7 +123,8 @@ TEXTURES = [
 
 # ── Aliases (from tag_processor.py _build_alias_map) ─────────────────────────
 
-ALIASES: dict[str, str] = {
+# Read-only: _LOOKUP and the _normalize_lexical cache are derived from it at import
+ALIASES: Mapping[str, str] = MappingProxyType({
     # Genre aliases
     "hip-hop": "hip hop",
     "hiphop": "hip hop",
@@ -245,7 +259,7 @@ ALIASES: dict[str, str] = {
     "auto tune": "autotune",
     "talk box": "vocoder",
     "talkbox": "vocoder",
-}
+})
 
 # ── Category config (from Data-Tool config/prompts.json) ─────────────────────
 
@@ -264,41 +278,65 @@ TAG_ORDER = ["genre", "mood", "instruments", "vocal", "vocal_fx", "rap_style", "
 
 # ── Lookup structures ────────────────────────────────────────────────────────
 
-_GENRE_SET = set(GENRES)
-_MOOD_SET = set(MOODS)
-_INSTRUMENT_SET = set(INSTRUMENTS)
-_VOCAL_SET = set(VOCALS)
-_VOCAL_FX_SET = set(VOCAL_FX)
-_RAP_STYLE_SET = set(RAP_STYLES)
-_TEXTURE_SET = set(TEXTURES)
+_GENRE_SET = frozenset(GENRES)
+_MOOD_SET = frozenset(MOODS)
+_INSTRUMENT_SET = frozenset(INSTRUMENTS)
+_VOCAL_SET = frozenset(VOCALS)
+_VOCAL_FX_SET = frozenset(VOCAL_FX)
+_RAP_STYLE_SET = frozenset(RAP_STYLES)
+_TEXTURE_SET = frozenset(TEXTURES)
 
 # Combined whitelist for fuzzy matching: tag → category
-# Built in REVERSE priority order so higher-priority categories overwrite lower ones.
+# Built in priority order; setdefault keeps the first (highest-priority)
+# category for a tag listed twice, with one write per key.
 # Priority: genre > mood > instruments > vocal > rap_style > vocal_fx > texture
 _ALL_TAGS: dict[str, str] = {}
-for _tag in TEXTURES:
-    _ALL_TAGS[_tag] = "texture"
-for _tag in VOCAL_FX:
-    _ALL_TAGS[_tag] = "vocal_fx"
-for _tag in RAP_STYLES:
-    _ALL_TAGS[_tag] = "rap_style"
-for _tag in VOCALS:
-    _ALL_TAGS[_tag] = "vocal"
-for _tag in INSTRUMENTS:
-    _ALL_TAGS[_tag] = "instruments"
-for _tag in MOODS:
-    _ALL_TAGS[_tag] = "mood"
-for _tag in GENRES:
-    _ALL_TAGS[_tag] = "genre"
+for _category, _vocab in (
+    ("genre", GENRES), ("mood", MOODS), ("instruments", INSTRUMENTS), ("vocal", VOCALS),
+    ("rap_style", RAP_STYLES), ("vocal_fx", VOCAL_FX), ("texture", TEXTURES),
+):
+    for _tag in _vocab:
+        _ALL_TAGS.setdefault(_tag, _category)
+_ALL_TAG_KEYS: tuple[str, ...] = tuple(_ALL_TAGS)
+
+# Alias + whitelist in one table: raw tag → (canonical tag, category). Aliases
+# win over a same-named whitelist entry; an alias whose target is not
+# whitelisted has no entry and is resolved by the slow path.
+_LOOKUP: dict[str, tuple[str, str]] = {t: (t, c) for t, c in _ALL_TAGS.items()}
+for _alias, _canonical in ALIASES.items():
+    if _canonical in _ALL_TAGS:
+        _LOOKUP[_alias] = (_canonical, _ALL_TAGS[_canonical])
+    else:
+        _LOOKUP.pop(_alias, None)
+
+# Sorted keys: all completions of a prefix sit in one contiguous run
+_SORTED_TAG_KEYS: tuple[str, ...] = tuple(sorted(_ALL_TAG_KEYS))
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# Trigram → whitelist keys containing it, for the difflib candidate shortlist
+_TRIGRAM_INDEX: dict[str, list[str]] = {}
+for _tag in _ALL_TAG_KEYS:
+    for _gram in _trigrams(_tag):
+        _TRIGRAM_INDEX.setdefault(_gram, []).append(_tag)
+
 
 # ── Semantic similarity index (lazy-loaded on first use) ─────────────────────
 
 _SEMANTIC_LOCK = threading.Lock()
 _semantic_model: "SentenceTransformer | None" = None
 _semantic_embeddings: "np.ndarray | None" = None
-_semantic_tags: list[str] = []
+_semantic_tags: tuple[str, ...] = ()
 _SEMANTIC_MODEL_NAME = "all-MiniLM-L6-v2"
 _SEMANTIC_THRESHOLD = 0.75  # cosine similarity cutoff (higher = fewer false antonym matches)
+# cleaned tag → match, least recently used evicted past _SEMANTIC_CACHE_MAX — the
+# keys are free-form LLM output, so the cache must not grow for the server's lifetime
+_semantic_cache: "OrderedDict[str, tuple[str | None, str | None]]" = OrderedDict()
+_SEMANTIC_CACHE_MAX = 4096
 
 
 def _get_semantic_index():
@@ -314,38 +352,69 @@ def _get_semantic_index():
             import numpy as np
             from sentence_transformers import SentenceTransformer
             model = SentenceTransformer(_SEMANTIC_MODEL_NAME)
-            tags = list(_ALL_TAGS.keys())
-            embeddings = model.encode(tags, normalize_embeddings=True, show_progress_bar=False)
+            tags = _ALL_TAG_KEYS
+            # Keyed by model + whitelist, so editing either re-encodes
+            digest = hashlib.sha1("\n".join((_SEMANTIC_MODEL_NAME, *tags)).encode()).hexdigest()[:16]
+            cache_path = SEMANTIC_CACHE_DIR / f"tag-embeddings-{digest}.npy"
+            try:
+                embeddings = np.load(cache_path, mmap_mode="r")
+            except (OSError, ValueError):
+                embeddings = np.array(model.encode(tags, normalize_embeddings=True, show_progress_bar=False))
+                try:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    np.save(cache_path, embeddings)
+                except OSError:
+                    pass
             _semantic_model = model
-            _semantic_embeddings = np.array(embeddings)
+            _semantic_embeddings = embeddings
             _semantic_tags = tags
         except Exception:
             _semantic_model = None
             _semantic_embeddings = None
-            _semantic_tags = []
+            _semantic_tags = ()
     return _semantic_model, _semantic_embeddings, _semantic_tags
 
 
+def warm_semantic_index():
+    """Build the semantic index on a daemon thread, off the first request's path."""
+    threading.Thread(target=_get_semantic_index, name="semantic-index", daemon=True).start()
+
+
 def _semantic_match(tag: str) -> tuple[str | None, str | None]:
     """Find closest whitelisted tag by semantic similarity.
 
     Handles variations like 'darker' → 'dark', 'more energetic' → 'energetic',
     'melancholy' → 'melancholic' that fuzzy string matching misses.
     """
-    model, embeddings, tags = _get_semantic_index()
-    if model is None or embeddings is None:
-        return None, None
-    try:
-        import numpy as np
-        tag_vec = model.encode([tag], normalize_embeddings=True, show_progress_bar=False)
-        scores = embeddings @ tag_vec[0]  # cosine similarity (embeddings already normalized)
-        best_idx = int(np.argmax(scores))
-        if scores[best_idx] >= _SEMANTIC_THRESHOLD:
-            matched = tags[best_idx]
-            return matched, _ALL_TAGS[matched]
-    except Exception:
-        pass
-    return None, None
+    return _semantic_match_many([tag])[0]
+
+
+def _semantic_match_many(queries: list[str]) -> list[tuple[str | None, str | None]]:
+    """_semantic_match for several tags; the uncached ones share one batched encode."""
+    found: dict[str, tuple[str | None, str | None]] = {}
+    pending = []
+    for q in dict.fromkeys(queries):
+        if q in _semantic_cache:
+            _semantic_cache.move_to_end(q)
+            found[q] = _semantic_cache[q]
+        else:
+            pending.append(q)
+    if pending:
+        model, embeddings, tags = _get_semantic_index()
+        if model is None or embeddings is None:
+            return [found.get(q, (None, None)) for q in queries]
+        try:
+            import numpy as np
+            query_vecs = model.encode(pending, normalize_embeddings=True, show_progress_bar=False, batch_size=32)
+            scores = embeddings @ np.asarray(query_vecs).T  # [n_tags, n_queries] cosine similarity
+            for col, idx in enumerate(np.argmax(scores, axis=0)):
+                matched = tags[int(idx)] if scores[idx, col] >= _SEMANTIC_THRESHOLD else None
+                found[pending[col]] = _semantic_cache[pending[col]] = (matched, _ALL_TAGS[matched] if matched else None)
+            while len(_semantic_cache) > _SEMANTIC_CACHE_MAX:
+                _semantic_cache.popitem(last=False)
+        except Exception:
+            pass
+    return [found.get(q, (None, None)) for q in queries]
 
 
 # Patterns to strip from tags (BPM/key/tempo/time sig don't belong in tags)
@@ -355,6 +424,43 @@ _STRIP_PATTERNS = re.compile(
     r"\btime\s+\d/\d\b",
     re.IGNORECASE,
 )
+_SMART_QUOTES = str.maketrans({"\u2018": "'", "\u2019": "'"})
+
+# Comparative/intensifier prefixes: "more X" → "X", "very X" → "X", etc.
+_COMPARATIVE_PREFIXES = ("more ", "less ", "very ", "extra ", "super ", "ultra ", "so ")
+
+
+def _unique_completion(tag: str) -> str | None:
+    """The one whitelist key that extends ``tag`` ("synthesiz" → "synthesizer").
+
+    Accepted only when the prefix is long enough that the pair would pass
+    the 0.88 fuzzy cutoff anyway — this is a shortcut, not a looser match.
+    """
+    i = bisect.bisect_left(_SORTED_TAG_KEYS, tag)
+    if i == len(_SORTED_TAG_KEYS) or not _SORTED_TAG_KEYS[i].startswith(tag):
+        return None
+    if i + 1 < len(_SORTED_TAG_KEYS) and _SORTED_TAG_KEYS[i + 1].startswith(tag):
+        return None  # ambiguous
+    key = _SORTED_TAG_KEYS[i]
+    return key if 2 * len(tag) >= 0.88 * (len(tag) + len(key)) else None
+
+
+def _fuzzy_shortlist(tag: str) -> list[str]:
+    """Whitelist keys that can plausibly reach a difflib ratio >= 0.88.
+
+    Index-then-verify: a candidate must share at least two padded trigrams
+    with the tag, and its length must allow the cutoff — ratio() is at most
+    2*min(a, b) / (a + b). Typically ~5 keys survive out of ~370.
+    """
+    shared: dict[str, int] = {}
+    for gram in _trigrams(tag):
+        for key in _TRIGRAM_INDEX.get(gram, ()):
+            shared[key] = shared.get(key, 0) + 1
+    n = len(tag)
+    return [
+        key for key, count in shared.items()
+        if count >= 2 and 2 * min(n, len(key)) >= 0.88 * (n + len(key))
+    ]
 
 
 def normalize_tag(tag: str) -> tuple[str | None, str | None]:
@@ -365,35 +471,49 @@ def normalize_tag(tag: str) -> tuple[str | None, str | None]:
     2. Drop if matches BPM/key/tempo pattern
     3. Alias lookup
     4. Direct whitelist match
-    5. Fuzzy match (SequenceMatcher >= 0.88)
+    5. Unique prefix completion, then fuzzy match (ratio >= 0.88; rapidfuzz if installed, else difflib)
+    6. Semantic similarity
 
     Returns (normalized_tag, category) or (None, None) if invalid.
     """
+    normalized, category, query = _normalize_lexical(tag)
+    if query is not None:
+        # Semantic similarity (handles 'darker'→'dark', 'more energetic'→'energetic', etc.)
+        return _semantic_match(query)
+    return normalized, category
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_lexical(tag: str) -> tuple[str | None, str | None, str | None]:
+    """Steps 1-5 of normalize_tag — everything short of the embedding model.
+
+    Returns (normalized_tag, category, None) on a match, (None, None, None)
+    for a rejected tag, or (None, None, cleaned_tag) when only the semantic
+    matcher is left to try.
+    """
     tag = tag.strip().lower()
-    tag = re.sub(r"\s+", " ", tag)  # collapse whitespace
-    tag = tag.replace("\u2018", "'").replace("\u2019", "'")  # smart quotes
+    # Most tags are already clean — only rewrite when there is something to
+    # fix. Whitespace other than a plain space is never printable.
+    if "  " in tag or not tag.isprintable():
+        tag = " ".join(tag.split())  # collapse whitespace
+    if "\u2018" in tag or "\u2019" in tag:
+        tag = tag.translate(_SMART_QUOTES)
     if not tag or len(tag) < 2:
-        return None, None
+        return None, None, None
 
     # Strip BPM/key/tempo mentions
     if _STRIP_PATTERNS.search(tag):
-        return None, None
-
-    # Apply alias
-    if tag in ALIASES:
-        tag = ALIASES[tag]
-
-    # Direct match
-    if tag in _ALL_TAGS:
-        return tag, _ALL_TAGS[tag]
-
-    # Strip comparative/intensifier prefixes: "more X" → "X", "very X" → "X", etc.
-    _COMPARATIVE_PREFIXES = ("more ", "less ", "very ", "extra ", "super ", "ultra ", "so ")
-    stripped = tag
-    for prefix in _COMPARATIVE_PREFIXES:
-        if tag.startswith(prefix):
-            stripped = tag[len(prefix):]
-            break
+        return None, None, None
+
+    # Alias / direct match
+    hit = _LOOKUP.get(tag)
+    if hit is not None:
+        return (*hit, None)
+    tag = ALIASES.get(tag, tag)
+
+    # Strip comparative/intensifier prefixes — startswith() takes the whole
+    # tuple in one C call; every prefix is a single word plus a space
+    stripped = tag.partition(" ")[2] if tag.startswith(_COMPARATIVE_PREFIXES) else tag
     # Strip comparative suffixes: "darker" → "dark", "heavier" → "heavy"
     if stripped == tag and tag.endswith("er") and len(tag) > 4:
         stripped = tag[:-2]  # "darker" → "dark"
@@ -403,17 +523,26 @@ def normalize_tag(tag: str) -> tuple[str | None, str | None]:
         if stripped in ALIASES:
             stripped = ALIASES[stripped]
         if stripped in _ALL_TAGS:
-            return stripped, _ALL_TAGS[stripped]
+            return stripped, _ALL_TAGS[stripped], None
+
+    # Truncated tag with a single possible completion
+    completion = _unique_completion(tag)
+    if completion is not None:
+        return completion, _ALL_TAGS[completion], None
 
-    # Fuzzy match (cutoff=0.88 from Data-Tool)
-    candidates = list(_ALL_TAGS.keys())
-    matches = difflib.get_close_matches(tag, candidates, n=1, cutoff=0.88)
-    if matches:
-        matched = matches[0]
-        return matched, _ALL_TAGS[matched]
+    # Fuzzy match (cutoff=0.88 from Data-Tool) — rapidfuzz's C++ scorer when
+    # installed, else difflib's pure-Python SequenceMatcher
+    if _rf_process is not None:
+        hit = _rf_process.extractOne(tag, _ALL_TAG_KEYS, scorer=_rf_fuzz.ratio, score_cutoff=88)
+        if hit:
+            return hit[0], _ALL_TAGS[hit[0]], None
+    else:
+        matches = difflib.get_close_matches(tag, _fuzzy_shortlist(tag), n=1, cutoff=0.88)
+        if matches:
+            matched = matches[0]
+            return matched, _ALL_TAGS[matched], None
 
-    # Semantic similarity (handles 'darker'→'dark', 'more energetic'→'energetic', etc.)
-    return _semantic_match(tag)
+    return None, None, tag
 
 
 @dataclass
@@ -430,7 +559,8 @@ def categorize_tags(raw_tags: str) -> dict[str, list[str]]:
     result: dict[str, list[str]] = {cat: [] for cat in TAG_ORDER}
     seen: set[str] = set()
 
-    for raw in raw_tags.split(","):
+    # Case and quote folding are per-character, so do them once for the CSV
+    for raw in raw_tags.lower().translate(_SMART_QUOTES).split(","):
         normalized, category = normalize_tag(raw)
         if normalized and category and normalized not in seen:
             seen.add(normalized)
@@ -440,24 +570,33 @@ def categorize_tags(raw_tags: str) -> dict[str, list[str]]:
     return result
 
 
-def _categorize_tags_detailed(raw_tags: str) -> tuple[dict[str, list[str]], list[tuple[str, str]], list[tuple[str, str]]]:
-    """Like categorize_tags but also returns drop/fuzzy info."""
+def _categorize_tags_detailed(raw_tags: Iterable[str]) -> tuple[dict[str, list[str]], list[tuple[str, str]], list[tuple[str, str]]]:
+    """Like categorize_tags (on already-split tags) but also returns drop/fuzzy info."""
     result: dict[str, list[str]] = {cat: [] for cat in TAG_ORDER}
     seen: set[str] = set()
     dropped: list[tuple[str, str]] = []
     fuzzy_matched: list[tuple[str, str]] = []
 
-    for raw in raw_tags.split(","):
-        raw_stripped = raw.strip()
-        if not raw_stripped:
-            continue
-        normalized, category = normalize_tag(raw_stripped)
+    stripped_tags = [t for t in (raw.strip() for raw in raw_tags) if t]
+    # Lowercased once here and reused below; the lexical cache is keyed on it,
+    # so case variants of a tag share one entry
+    lowered_tags = [t.lower() for t in stripped_tags]
+    # Lexical pass first; whatever is left for the embedding model is then
+    # encoded in one batch instead of one forward pass per tag
+    lexical = [_normalize_lexical(t) for t in lowered_tags]
+    queries = list(dict.fromkeys(q for _, _, q in lexical if q is not None))
+    semantic = dict(zip(queries, _semantic_match_many(queries)))
+
+    for raw_stripped, lowered, (normalized, category, query) in zip(stripped_tags, lowered_tags, lexical):
+        if query is not None:
+            normalized, category = semantic[query]
         if normalized is None:
             dropped.append((raw_stripped, "not in whitelist"))
             continue
-        if normalized != raw_stripped.strip().lower().replace("\u2018", "'").replace("\u2019", "'"):
+        folded = lowered.translate(_SMART_QUOTES)
+        if normalized != folded:
             # Was fuzzy-matched or aliased
-            clean = re.sub(r"\s+", " ", raw_stripped.strip().lower())
+            clean = " ".join(folded.split())
             if clean != normalized and clean not in ALIASES:
                 fuzzy_matched.append((raw_stripped, normalized))
         if normalized in seen:
@@ -469,6 +608,18 @@ def _categorize_tags_detailed(raw_tags: str) -> tuple[dict[str, list[str]], list
     return result, dropped, fuzzy_matched
 
 
+# Vocal presence as a bitmask: one bit per vocal type, in priority order
+# (rap types > vocal types > spoken word > instrumental)
+_VOCAL_PRIORITY = ("male rap", "female rap", "male vocal", "female vocal",
+                   "male feature vocal", "female feature vocal", "spoken word", "instrumental")
+_VOCAL_BIT: dict[str, int] = {v: 1 << i for i, v in enumerate(_VOCAL_PRIORITY)}
+# (keeper, loser) bits for each mutually exclusive pair
+_VOCAL_CONFLICTS = (
+    (_VOCAL_BIT["male vocal"], _VOCAL_BIT["female vocal"]),
+    (_VOCAL_BIT["male rap"], _VOCAL_BIT["female rap"]),
+)
+
+
 def resolve_conflicts(tags_by_category: dict[str, list[str]]) -> dict[str, list[str]]:
     """Resolve mutual exclusions (from Data-Tool tag_processor.py).
 
@@ -483,55 +634,53 @@ def resolve_conflicts(tags_by_category: dict[str, list[str]]) -> dict[str, list[
     if len(vocals) <= 1:
         return tags_by_category
 
-    # Priority: rap types > vocal types > spoken word > instrumental
-    priority = ["male rap", "female rap", "male vocal", "female vocal",
-                "male feature vocal", "female feature vocal", "spoken word", "instrumental"]
+    mask = 0
+    for v in vocals:
+        mask |= _VOCAL_BIT.get(v, 0)
 
-    # If instrumental is present with any vocal type, drop instrumental
-    if "instrumental" in vocals and len(vocals) > 1:
-        vocals = [v for v in vocals if v != "instrumental"]
+    # Instrumental loses to any vocal type (there are >= 2 vocals here); in
+    # each conflicting pair the higher-priority male variant wins
+    drop = _VOCAL_BIT["instrumental"]
+    for keeper, loser in _VOCAL_CONFLICTS:
+        if mask & keeper:
+            drop |= loser
 
-    # If conflicting pairs exist, keep highest priority
-    conflict_pairs = [
-        ({"male vocal", "female vocal"}),
-        ({"male rap", "female rap"}),
-    ]
-    for pair in conflict_pairs:
-        present = [v for v in vocals if v in pair]
-        if len(present) > 1:
-            # Keep the one that appears first in priority
-            keeper = min(present, key=lambda v: priority.index(v) if v in priority else 99)
-            vocals = [v for v in vocals if v not in pair or v == keeper]
-
-    tags_by_category["vocal"] = vocals[:1]  # max 1 vocal type
+    # max 1 vocal type — the first survivor in input order
+    tags_by_category["vocal"] = [v for v in vocals if not _VOCAL_BIT.get(v, 0) & drop][:1]
     return tags_by_category
 
 
 def validate_and_order_tags_detailed(raw_tags: str) -> TagResult:
     """Full pipeline with transparency: returns TagResult with drop/fuzzy/truncation info."""
+    return _validate_tag_list_detailed(raw_tags.split(","))
+
+
+def _validate_tag_list_detailed(raw_tags: Iterable[str]) -> TagResult:
     by_cat, dropped, fuzzy_matched = _categorize_tags_detailed(raw_tags)
     by_cat = resolve_conflicts(by_cat)
 
     truncated: list[tuple[str, str]] = []
 
-    # Enforce per-category max limits
-    for cat in TAG_ORDER:
-        _, max_count = CATEGORY_LIMITS[cat]
-        if len(by_cat[cat]) > max_count:
-            for tag in by_cat[cat][max_count:]:
-                truncated.append((tag, f"{cat} limit ({max_count})"))
-            by_cat[cat] = by_cat[cat][:max_count]
-
-    # Assemble in order
+    # Enforce per-category and total limits in one assembly pass; overflow is
+    # trimmed in place (del) rather than re-sliced into new lists. Total-limit
+    # drops are reported after every per-category drop.
     ordered: list[str] = []
+    over_total: list[tuple[str, str]] = []
+    total_reason = f"total limit ({MAX_TOTAL_TAGS})"
     for cat in TAG_ORDER:
-        ordered.extend(by_cat[cat])
-
-    # Enforce total limit
-    if len(ordered) > MAX_TOTAL_TAGS:
-        for tag in ordered[MAX_TOTAL_TAGS:]:
-            truncated.append((tag, f"total limit ({MAX_TOTAL_TAGS})"))
-        ordered = ordered[:MAX_TOTAL_TAGS]
+        _, max_count = CATEGORY_LIMITS[cat]
+        tags = by_cat[cat]
+        if len(tags) > max_count:
+            reason = f"{cat} limit ({max_count})"
+            truncated.extend((tag, reason) for tag in islice(tags, max_count, None))
+            del tags[max_count:]
+        room = MAX_TOTAL_TAGS - len(ordered)
+        if len(tags) > room:
+            over_total.extend((tag, total_reason) for tag in islice(tags, room, None))
+            ordered.extend(islice(tags, room))
+        else:
+            ordered.extend(tags)
+    truncated.extend(over_total)
 
     tags_str = ", ".join(ordered) if ordered else "atmospheric, experimental"
     return TagResult(tags=tags_str, dropped=dropped, fuzzy_matched=fuzzy_matched, truncated=truncated)
@@ -540,3 +689,8 @@ def validate_and_order_tags_detailed(raw_tags: str) -> TagResult:
 def validate_and_order_tags(raw_tags: str) -> str:
     """Full pipeline: split → normalize → categorize → resolve conflicts → enforce limits → order → rejoin."""
     return validate_and_order_tags_detailed(raw_tags).tags
+
+
+def validate_and_order_tags_from_list(tags: Iterable[str]) -> str:
+    """Same pipeline for callers that already hold the tags as a list (skips the CSV round trip)."""
+    return _validate_tag_list_detailed(tags).tags
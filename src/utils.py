@@ -1,4 +1,5 @@
 """Utility helpers salvaged from the old TUI."""
+import re
 import time
 
 
@@ -18,11 +19,13 @@ def fmt_countdown(deadline: float) -> str:
     return f"{m}:{s:02d}"
 
 
+# Non-music requests, as plain substrings — one alternation, one C-level scan
+_NON_MUSIC_RE = re.compile("|".join(map(re.escape, (
+    "weather", "what time", "what's the time", "date", "news",
+    "sports", "calculate", "translate", "google", "wikipedia",
+    "stock", "currency", "tell me a joke",
+))))
+
+
 def friendly_redirect(text: str) -> bool:
-    non_music = [
-        "weather", "what time", "what's the time", "date", "news",
-        "sports", "calculate", "translate", "google", "wikipedia",
-        "stock", "currency", "tell me a joke",
-    ]
-    t = text.lower()
-    return any(w in t for w in non_music)
+    return _NON_MUSIC_RE.search(text.lower()) is not None
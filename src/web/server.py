@@ -1,11 +1,12 @@
 """Starlette app — HTTP routes + WebSocket + static file serving."""
 import asyncio
-import json
+import hashlib
 import logging
+import os
+import stat
 import uuid
 from pathlib import Path
 
-import httpx
 from starlette.applications import Starlette
 from starlette.middleware import Middleware
 from starlette.middleware.cors import CORSMiddleware
@@ -14,11 +15,15 @@ from starlette.routing import Route, WebSocketRoute, Mount
 from starlette.staticfiles import StaticFiles
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
+from .. import fastjson
 from ..config import (
-    RADIOS_DIR, OLLAMA_HOST, OLLAMA_MODEL, ACESTEP_HOST, APP_VERSION, ROOT_DIR,
+    RADIOS_DIR, APP_VERSION, ROOT_DIR, WARM_SEMANTIC_INDEX,
 )
-from ..manager import Radio, RadioManager
+from ..manager import RadioManager
 from ..engine import RadioEngine
+from ..llm import close_client as close_llm_client
+from ..preflight import check_acestep, check_ollama, close_client as close_probe_client
+from ..tags import warm_semantic_index
 from .state import RadioState
 
 logger = logging.getLogger(__name__)
@@ -37,29 +42,8 @@ _transfer_timers: dict[str, asyncio.Task] = {}
 async def health(request):
     checks = {}
 
-    # Ollama
-    try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            r = await client.get(f"{OLLAMA_HOST}/api/tags")
-            if r.status_code == 200:
-                models = [m["name"] for m in r.json().get("models", [])]
-                has_model = any(
-                    m == OLLAMA_MODEL or m.startswith(OLLAMA_MODEL.split(":")[0])
-                    for m in models
-                )
-                checks["ollama"] = {"ok": True, "model": OLLAMA_MODEL, "model_available": has_model}
-            else:
-                checks["ollama"] = {"ok": False, "error": f"HTTP {r.status_code}"}
-    except Exception as e:
-        checks["ollama"] = {"ok": False, "error": str(e)}
-
-    # ACE-Step
-    try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            r = await client.get(f"{ACESTEP_HOST}/health")
-            checks["acestep"] = {"ok": r.status_code == 200}
-    except Exception as e:
-        checks["acestep"] = {"ok": False, "error": str(e)}
+    # Ollama + ACE-Step probed concurrently — latency is the slower one, not the sum
+    checks["ollama"], checks["acestep"] = await asyncio.gather(check_ollama(), check_acestep())
 
     # Disk
     manager = RadioManager()
@@ -83,7 +67,7 @@ async def list_radios(request):
     current = manager.current_radio().name
     radios = []
     for name in names:
-        r = Radio(name)
+        r = manager.get_radio(name)
         taste = r.load_taste()
         radios.append({
             "name": name,
@@ -91,7 +75,7 @@ async def list_radios(request):
             "last_played": r.get_last_played_fmt(),
             "is_current": name == current,
             "generation_count": taste.get("generation_count", 0),
-            "favorite_count": len(list(r.favorites_dir.glob("*.mp3"))),
+            "favorite_count": r.get_favorite_count(),
         })
     return JSONResponse({"radios": radios, "current": current})
 
@@ -99,14 +83,14 @@ async def list_radios(request):
 async def radio_history(request):
     name = request.path_params["name"]
     limit = int(request.query_params.get("limit", "20"))
-    r = Radio(name)
+    r = RadioManager().get_radio(name)
     history = r.get_history(limit)
     return JSONResponse({"history": history})
 
 
 async def radio_favorites(request):
     name = request.path_params["name"]
-    r = Radio(name)
+    r = RadioManager().get_radio(name)
     favorites = r.get_favorites()
     return JSONResponse({"favorites": favorites})
 
@@ -122,14 +106,17 @@ async def serve_audio(request):
     if ".." in radio_name or ".." in filename or "/" in filename:
         return Response("Forbidden", status_code=403)
 
-    file_path = RADIOS_DIR / radio_name / "tracks" / filename
-    if not file_path.exists():
-        # Also check favorites
-        file_path = RADIOS_DIR / radio_name / "favorites" / filename
-        if not file_path.exists():
-            return Response("Not found", status_code=404)
-
-    return FileResponse(file_path, media_type="audio/mpeg")
+    # Tracks first, then favorites; the stat is handed to FileResponse so it
+    # doesn't stat the file again
+    for sub in ("tracks", "favorites"):
+        file_path = os.path.join(RADIOS_DIR, radio_name, sub, filename)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            return FileResponse(file_path, media_type="audio/mpeg", stat_result=st)
+    return Response("Not found", status_code=404)
 
 
 # ── WebSocket ────────────────────────────────────────────────────────────────
@@ -143,38 +130,38 @@ async def websocket_endpoint(websocket: WebSocket):
     # Send initial sync
     if _engine:
         snapshot = _engine.get_snapshot()
-        await websocket.send_json({"type": "sync", "data": snapshot})
-
-    # Two tasks: one reads from client, one writes from queue
-    async def _reader():
-        try:
-            while True:
-                data = await websocket.receive_json()
-                await _handle_ws_message(client_id, data)
-        except WebSocketDisconnect:
-            pass
-        except Exception as e:
-            logger.error("WS reader error: %s", e)
+        await websocket.send_text(fastjson.dumps({"type": "sync", "data": snapshot}).decode())
 
+    # The endpoint itself reads from the client; one task drains the queue
     async def _writer():
         try:
             while True:
-                event, data = await queue.get()
-                await websocket.send_json({"type": event, "data": data})
+                await websocket.send_text(await queue.get())
         except Exception:
-            pass
+            # Send failed — stop queueing for this client and close the socket
+            # so the read loop below ends too
+            _state.unsubscribe(client_id)
+            try:
+                await websocket.close()
+            except Exception:
+                pass
 
-    reader_task = asyncio.create_task(_reader())
     writer_task = asyncio.create_task(_writer())
 
     try:
-        done, pending = await asyncio.wait(
-            [reader_task, writer_task],
-            return_when=asyncio.FIRST_COMPLETED,
-        )
-        for task in pending:
-            task.cancel()
+        while True:
+            data = fastjson.loads(await websocket.receive_text())
+            await _handle_ws_message(client_id, data)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error("WS reader error: %s", e)
     finally:
+        writer_task.cancel()
+        try:
+            await writer_task
+        except asyncio.CancelledError:
+            pass
         _state.unsubscribe(client_id)
         logger.info("WS disconnected: %s", client_id)
         # Cancel any transfer timer for this client
@@ -183,77 +170,71 @@ async def websocket_endpoint(websocket: WebSocket):
             timer.cancel()
 
 
-async def _handle_ws_message(client_id: str, data: dict):
-    """Route incoming WebSocket messages to engine methods."""
-    if not _engine:
-        return
-
-    msg_type = data.get("type", "")
-
-    if msg_type == "reaction":
-        text = data.get("text", "").strip()
-        if text:
-            await _engine.submit_reaction(text)
-
-    elif msg_type == "pause":
-        await _engine.pause()
+async def _ws_reaction(engine: RadioEngine, data: dict):
+    text = data.get("text", "").strip()
+    if text:
+        await engine.submit_reaction(text)
 
-    elif msg_type == "resume":
-        await _engine.resume()
 
-    elif msg_type == "toggle_pause":
-        await _engine.toggle_pause()
+async def _ws_switch_radio(engine: RadioEngine, data: dict):
+    name = data.get("name", "").strip()
+    if name:
+        await engine.switch_radio(name)
 
-    elif msg_type == "skip":
-        await _engine.skip()
 
-    elif msg_type == "save":
-        await _engine.save()
+async def _ws_create_radio(engine: RadioEngine, data: dict):
+    name = data.get("name", "").strip()
+    vibe = data.get("vibe", "").strip()
+    if name:
+        await engine.create_radio(name, vibe)
 
-    elif msg_type == "like":
-        await _engine.like()
 
-    elif msg_type == "dislike":
-        await _engine.dislike()
+async def _ws_delete_radio(engine: RadioEngine, data: dict):
+    name = data.get("name", "").strip()
+    if name:
+        await engine.delete_radio(name)
 
-    elif msg_type == "volume":
-        level = data.get("level", 80)
-        await _engine.set_volume(int(level))
 
-    elif msg_type == "seek":
-        delta = data.get("delta", 0)
-        await _engine.seek(float(delta))
+async def _ws_clean_radio(engine: RadioEngine, data: dict):
+    await engine.clean_radio()
+    await _state.broadcast("toast", {"message": "Taste profile cleared"})
 
-    elif msg_type == "switch_radio":
-        name = data.get("name", "").strip()
-        if name:
-            await _engine.switch_radio(name)
 
-    elif msg_type == "create_radio":
-        name = data.get("name", "").strip()
-        vibe = data.get("vibe", "").strip()
-        if name:
-            await _engine.create_radio(name, vibe)
+# msg type → handler(engine, data); one dict lookup per message instead of an elif chain
+_WS_HANDLERS = {
+    "reaction": _ws_reaction,
+    "pause": lambda engine, data: engine.pause(),
+    "resume": lambda engine, data: engine.resume(),
+    "toggle_pause": lambda engine, data: engine.toggle_pause(),
+    "skip": lambda engine, data: engine.skip(),
+    "save": lambda engine, data: engine.save(),
+    "like": lambda engine, data: engine.like(),
+    "dislike": lambda engine, data: engine.dislike(),
+    "volume": lambda engine, data: engine.set_volume(int(data.get("level", 80))),
+    "seek": lambda engine, data: engine.seek(float(data.get("delta", 0))),
+    "switch_radio": _ws_switch_radio,
+    "create_radio": _ws_create_radio,
+    "delete_radio": _ws_delete_radio,
+    "clean_radio": _ws_clean_radio,
+    "first_vibe": lambda engine, data: engine.set_first_vibe(data.get("text", "").strip()),
+    # Browser audio ended — advance to next if ready, else loop
+    "track_ended": lambda engine, data: engine.track_ended(),
+}
 
-    elif msg_type == "delete_radio":
-        name = data.get("name", "").strip()
-        if name:
-            await _engine.delete_radio(name)
 
-    elif msg_type == "clean_radio":
-        await _engine.clean_radio()
-        await _state.broadcast("toast", {"message": "Taste profile cleared"})
-
-    elif msg_type == "first_vibe":
-        text = data.get("text", "").strip()
-        await _engine.set_first_vibe(text)
-
-    elif msg_type == "track_ended":
-        # Browser audio ended — advance to next if ready, else loop
-        await _engine.track_ended()
+async def _handle_ws_message(client_id: str, data: dict):
+    """Route incoming WebSocket messages to engine methods."""
+    engine = _engine
+    if not engine:
+        return
 
-    else:
+    msg_type = data.get("type", "")
+    # isinstance guard: a malformed (unhashable) type must not break dict lookup
+    handler = _WS_HANDLERS.get(msg_type) if isinstance(msg_type, str) else None
+    if handler is None:
         logger.warning("Unknown WS message type: %s", msg_type)
+        return
+    await handler(engine, data)
 
 
 # ── SPA fallback ─────────────────────────────────────────────────────────────
@@ -269,11 +250,31 @@ async def spa_fallback(request):
         if file_path.is_file() and dist_dir in file_path.resolve().parents:
             return FileResponse(file_path)
 
-    # SPA fallback — serve index.html
-    index = dist_dir / "index.html"
-    if index.exists():
-        return FileResponse(index)
-    return Response("Frontend not built. Run: cd web && npm run build", status_code=503)
+    # SPA fallback — serve index.html from memory
+    cached = _load_index(dist_dir / "index.html")
+    if cached is None:
+        return Response("Frontend not built. Run: cd web && npm run build", status_code=503)
+    body, etag = cached
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"etag": etag})
+    return Response(body, media_type="text/html", headers={"etag": etag})
+
+
+# index.html → (mtime_ns, body, etag); re-read only when a rebuild changes the mtime
+_index_cache: dict[Path, tuple[int, bytes, str]] = {}
+
+
+def _load_index(index: Path) -> tuple[bytes, str] | None:
+    """Return (body, etag) for index.html, or None if the frontend isn't built."""
+    try:
+        mtime = index.stat().st_mtime_ns
+    except OSError:
+        return None
+    cached = _index_cache.get(index)
+    if cached is None or cached[0] != mtime:
+        body = index.read_bytes()
+        cached = _index_cache[index] = (mtime, body, f'"{hashlib.sha1(body).hexdigest()}"')
+    return cached[1], cached[2]
 
 
 # ── App factory ──────────────────────────────────────────────────────────────
@@ -321,6 +322,8 @@ def create_app() -> Starlette:
 async def _on_startup():
     """Start the radio engine as a background task."""
     global _engine_task
+    if WARM_SEMANTIC_INDEX:
+        warm_semantic_index()
     if _engine:
         _engine_task = asyncio.create_task(_engine.run())
         logger.info("Radio engine started")
@@ -338,3 +341,5 @@ async def _on_shutdown():
             await _engine_task
         except (asyncio.CancelledError, Exception):
             pass
+    await close_llm_client()
+    await close_probe_client()
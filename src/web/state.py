@@ -3,6 +3,8 @@ import asyncio
 import logging
 from typing import Any
 
+from .. import fastjson
+
 logger = logging.getLogger(__name__)
 
 
@@ -12,7 +14,7 @@ class RadioState:
         self._subscribers: dict[str, asyncio.Queue] = {}
 
     def subscribe(self, client_id: str) -> asyncio.Queue:
-        """Register a new client. Returns a queue that receives (event, data) tuples."""
+        """Register a new client. Returns a queue that receives encoded JSON text frames."""
         q: asyncio.Queue = asyncio.Queue(maxsize=50)
         self._subscribers[client_id] = q
         return q
@@ -25,20 +27,34 @@ class RadioState:
         return len(self._subscribers)
 
     async def broadcast(self, event: str, data: Any):
-        """Push an event to all connected clients."""
-        dead = []
+        """Push an event to all connected clients.
+
+        The frame is serialized once here and shared by every client queue,
+        rather than re-encoded by each client's writer.
+        """
+        if not self._subscribers:
+            return
+        try:
+            frame = fastjson.dumps({"type": event, "data": data}).decode()
+        except TypeError:
+            logger.exception("Unserializable %s event dropped", event)
+            return
+        dead = None  # allocated only if a client has to be dropped
         for cid, q in self._subscribers.items():
             try:
-                q.put_nowait((event, data))
+                q.put_nowait(frame)
             except asyncio.QueueFull:
                 # Client too slow — drop oldest
                 try:
                     q.get_nowait()
-                    q.put_nowait((event, data))
+                    q.put_nowait(frame)
                 except (asyncio.QueueEmpty, asyncio.QueueFull):
+                    if dead is None:
+                        dead = []
                     dead.append(cid)
-        for cid in dead:
-            self._subscribers.pop(cid, None)
+        if dead:
+            for cid in dead:
+                self._subscribers.pop(cid, None)
 
     async def set_radio(self, name: str):
         self.radio_name = name